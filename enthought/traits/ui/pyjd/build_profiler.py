@@ -0,0 +1,227 @@
+#------------------------------------------------------------------------------
+#  Copyright (c) 2009, Richard Lincoln
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to
+#  deal in the Software without restriction, including without limitation the
+#  rights to use, copy, modify, merge, publish, distribute, sublicense, and/or
+#  sell copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in
+#  all copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+#  FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+#  IN THE SOFTWARE.
+#------------------------------------------------------------------------------
+
+""" Defines a profiler recording where the time goes when a panel is built.
+
+    The profiler is enabled by setting the 'profiler' trait of the Pyjamas
+    GUIToolkit object:
+
+        from enthought.traits.ui.toolkit import toolkit
+        from enthought.traits.ui.pyjd.build_profiler import BuildProfiler
+
+        profiler = toolkit().profiler = BuildProfiler()
+        ...
+        print profiler.report()
+        open( 'build.json', 'w' ).write( profiler.chrome_trace() )
+"""
+
+#------------------------------------------------------------------------------
+#  Imports:
+#------------------------------------------------------------------------------
+
+import json
+import time
+
+#------------------------------------------------------------------------------
+#  Returns the number of widgets in a widget tree:
+#------------------------------------------------------------------------------
+
+def count_widgets ( widget, counts = None ):
+    """ Returns the number of widgets in the tree rooted at a widget. If a
+        counts dictionary is given, the number of widgets in the tree rooted
+        at each widget of the tree is recorded in it, keyed by widget id.
+    """
+    if widget is None:
+        return 0
+
+    n = 1
+    try:
+        # Pyjamas panels iterate over their child widgets:
+        children = list( widget )
+    except TypeError:
+        children = []
+
+    for child in children:
+        n += count_widgets( child, counts )
+
+    if counts is not None:
+        counts[ id( widget ) ] = n
+
+    return n
+
+#------------------------------------------------------------------------------
+#  "BuildSpan" class:
+#------------------------------------------------------------------------------
+
+class BuildSpan ( object ):
+    """ A timed step of building a panel.
+    """
+
+    def __init__ ( self, kind, name, start ):
+        """ Initialise the object.
+        """
+        # The kind of step (e.g. 'group', 'items', 'prepare' or 'init'):
+        self.kind = kind
+
+        # The name of the group or item the step is for:
+        self.name = name
+
+        # The time the step started (in seconds):
+        self.start = start
+
+        # The wall time the step took (in seconds), or None if unfinished:
+        self.duration = None
+
+        # The number of widgets in the control created by the step:
+        self.widgets = 0
+
+        # The control created by the step (until its widgets are counted):
+        self.control = None
+
+        # The steps performed as part of this one:
+        self.children = []
+
+#------------------------------------------------------------------------------
+#  "BuildProfiler" class:
+#------------------------------------------------------------------------------
+
+class BuildProfiler ( object ):
+    """ Records the wall time and widget count of each group, list of items
+        and editor built for a panel.
+    """
+
+    def __init__ ( self ):
+        """ Initialise the object.
+        """
+        self.clear()
+
+    def clear ( self ):
+        """ Discards everything recorded so far.
+        """
+        # The top-level steps recorded:
+        self.spans = []
+
+        # The steps currently in progress:
+        self._stack = []
+
+    def begin ( self, kind, name = '' ):
+        """ Begins recording a step and returns its span.
+        """
+        span = BuildSpan( kind, name, time.time() )
+        if len( self._stack ) > 0:
+            self._stack[-1].children.append( span )
+        else:
+            self.spans.append( span )
+
+        self._stack.append( span )
+
+        return span
+
+    def end ( self, span, control = None ):
+        """ Ends recording a step (and any unfinished steps within it), given
+            its span and the control it created.
+
+            The widgets created by each step are only counted once the
+            top-level step has ended, in a single pass over its control, so
+            counting them does not add to the time taken by any step.
+        """
+        if span not in self._stack:
+            return
+
+        now = time.time()
+        while True:
+            top = self._stack.pop()
+            if top.duration is None:
+                top.duration = now - top.start
+            if top is span:
+                break
+
+        span.control = control
+        if len( self._stack ) == 0:
+            self._count( span, {} )
+
+    def report ( self ):
+        """ Returns the recorded steps as an indented tree report.
+        """
+        lines = [ '%10s %8s  %s' % ( 'time (ms)', 'widgets', 'step' ) ]
+        for span in self.spans:
+            self._report( span, 0, lines )
+
+        return '\n'.join( lines )
+
+    def chrome_trace ( self ):
+        """ Returns the recorded steps in the Chrome trace event JSON format
+            (as loaded by chrome://tracing).
+        """
+        events = []
+        for span in self.spans:
+            self._trace( span, events )
+
+        return json.dumps( { 'traceEvents': events } )
+
+    def _count ( self, span, counts ):
+        """ Counts the widgets created by a step and the steps within it.
+        """
+        control = span.control
+        if control is not None:
+            span.widgets = counts.get( id( control ) )
+            if span.widgets is None:
+                span.widgets = count_widgets( control, counts )
+            span.control = None
+
+        for child in span.children:
+            self._count( child, counts )
+
+    def _report ( self, span, level, lines ):
+        """ Adds the report lines for a step and its children.
+        """
+        if span.duration is None:
+            duration = '?'
+        else:
+            duration = '%.2f' % (span.duration * 1000.0)
+
+        step = span.kind
+        if span.name != '':
+            step = '%s %s' % ( step, span.name )
+
+        lines.append( '%10s %8d  %s%s' %
+                      ( duration, span.widgets, '  ' * level, step ) )
+
+        for child in span.children:
+            self._report( child, level + 1, lines )
+
+    def _trace ( self, span, events ):
+        """ Adds the trace events for a step and its children.
+        """
+        events.append( { 'name': span.name or span.kind,
+                         'cat':  span.kind,
+                         'ph':   'X',
+                         'ts':   int( span.start * 1e6 ),
+                         'dur':  int( (span.duration or 0.0) * 1e6 ),
+                         'pid':  1,
+                         'tid':  1,
+                         'args': { 'widgets': span.widgets } } )
+
+        for child in span.children:
+            self._trace( child, events )
+
+# EOF -------------------------------------------------------------------------
@@ -41,6 +41,12 @@ OKColor = "White"
 # Color to highlight input errors.
 ErrorColor = "#%02x%02x%02x" % ( 255, 192, 192 )
 
+# Style of controls with input errors.
+ErrorStyle = "background-color: %s;" % ErrorColor
+
+# Style name of controls with input errors.
+ErrorStyleName = "traits-error"
+
 # Color for background of windows (like dialog background color).
 if (sys.platform == 'darwin'):
     WindowColor = "#%02x%02x%02x" % ( 232, 232, 232 )
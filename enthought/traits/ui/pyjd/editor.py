@@ -28,20 +28,124 @@
 #  Imports:
 #------------------------------------------------------------------------------
 
-import sys
+from __pyjamas__ import doc
 
+from pyjamas import DOM
 from pyjamas import Window
+from pyjamas.Timer import Timer
 #from pyjamas.ui import RootPanel
 #from Tooltip import TooltipListener
 
 from enthought.traits.api \
-    import HasTraits, Int, Instance, Str, Callable
+    import HasTraits, Int, Instance, Str, Callable, Bool
 
 from enthought.traits.ui.editor \
     import Editor as UIEditor
 
+from enthought.traits.ui.toolkit \
+    import toolkit
+
 from constants \
-    import WindowColor, OKColor, ErrorColor
+    import WindowColor, ErrorStyle, ErrorStyleName
+
+#------------------------------------------------------------------------------
+#  'ErrorStateSheet' class:
+#------------------------------------------------------------------------------
+
+class ErrorStateSheet ( object ):
+    """ Shows the error state of editor controls by toggling a single style
+        name on each control, which is styled by one style sheet rule created
+        when the first control is put in an error state.
+    """
+
+    def __init__ ( self ):
+        """ Initialise the object.
+        """
+        # The 'style' element holding the rule (once created):
+        self._element = None
+
+    def set_state ( self, control, state ):
+        """ Sets whether a control is shown in an error state.
+        """
+        # The state last set is kept on the control itself, so that nothing
+        # needs to be forgotten when the control is disposed of:
+        state = bool( state )
+        if state == getattr( control, '_error_state', False ):
+            return
+
+        control._error_state = state
+        if state:
+            if self._element is None:
+                self._create_rule()
+
+            control.addStyleName( ErrorStyleName )
+        else:
+            control.removeStyleName( ErrorStyleName )
+
+    def _create_rule ( self ):
+        """ Creates the rule styling the controls in an error state.
+        """
+        element = self._element = DOM.createElement( 'style' )
+        DOM.setInnerText( element, '.%s { %s }' % ( ErrorStyleName,
+                                                    ErrorStyle ) )
+        head = doc().getElementsByTagName( 'head' ).item( 0 )
+        DOM.appendChild( head, element )
+
+# The style sheet showing the error state of all editor controls:
+error_state_sheet = ErrorStateSheet()
+
+#------------------------------------------------------------------------------
+#  'RenderScheduler' class:
+#------------------------------------------------------------------------------
+
+class RenderScheduler ( object ):
+    """ Coalesces the updates of the editors of a UI, so that an editor whose
+        object trait changes many times within one event loop tick is only
+        updated once, with the latest value.
+    """
+
+    def __init__ ( self ):
+        """ Initialise the object.
+        """
+        # The editors waiting to be updated, in the order they were changed:
+        self._dirty = []
+
+        # Mapping of editor id to each editor waiting to be updated:
+        self._pending = {}
+
+        # The timer which flushes the updates (if scheduled):
+        self._timer = None
+
+    def schedule ( self, editor ):
+        """ Marks an editor as needing to be updated on the next tick.
+        """
+        if id( editor ) in self._pending:
+            return
+
+        self._pending[ id( editor ) ] = editor
+        self._dirty.append( editor )
+
+        if self._timer is None:
+            self._timer = Timer( notify = self._on_timer )
+            self._timer.schedule( 0 )
+
+    def flush ( self ):
+        """ Updates all editors waiting to be updated.
+        """
+        dirty = self._dirty
+        self._dirty = []
+        self._pending = {}
+
+        for editor in dirty:
+            # Skip editors which have been disposed of in the meantime:
+            if editor.control is not None:
+                editor.update_editor()
+
+    def _on_timer ( self, timer ):
+        """ Handles the flush timer firing.
+        """
+        self._timer = None
+        self.flush()
 
 #------------------------------------------------------------------------------
 #  'Editor' class:
@@ -51,6 +155,15 @@ class Editor ( UIEditor ):
     """ Base class for PyQt editors for Traits-based UIs.
     """
 
+    #---------------------------------------------------------------------------
+    #  Trait definitions:
+    #---------------------------------------------------------------------------
+
+    # May changes to the object trait be pushed to the control once per event
+    # loop tick when the toolkit's 'coalesce_updates' is enabled? (Editors
+    # which must show each change as it is made set this to False):
+    coalesce_updates = Bool( True )
+
 #    def clear_layout(self):
 #        """ Delete the contents of a control's layout.
 #        """
@@ -72,6 +185,79 @@ class Editor ( UIEditor ):
         if control is not None:
             control._editor = self
 
+        # The text shown by a new control is not known:
+        self._shadow_text = None
+
+    #---------------------------------------------------------------------------
+    #  Finishes setting up the editor:
+    #---------------------------------------------------------------------------
+
+    def prepare ( self, parent ):
+        """ Finishes setting up the editor, recording the time taken by it
+            (and by **init**) if panel building is being profiled.
+        """
+        profiler = toolkit().profiler
+        if profiler is None:
+            super( Editor, self ).prepare( parent )
+            return
+
+        # The 'init' step is ended by '_sync_values', which the base class
+        # calls as soon as the control has been created:
+        span = profiler.begin( 'prepare', self.name )
+        self._init_span = profiler.begin( 'init', self.name )
+        try:
+            super( Editor, self ).prepare( parent )
+        finally:
+            self._init_span = None
+            profiler.end( span, self.control )
+
+    #---------------------------------------------------------------------------
+    #  Initializes the synchronized values of the editor:
+    #---------------------------------------------------------------------------
+
+    def _sync_values ( self ):
+        """ Initializes the synchronized values of the editor, ending the
+            profiled 'init' step (if any) first.
+        """
+        span = self._init_span
+        if span is not None:
+            self._init_span = None
+            toolkit().profiler.end( span, self.control )
+
+        super( Editor, self )._sync_values()
+
+    #---------------------------------------------------------------------------
+    #  Handles the object trait changing:
+    #---------------------------------------------------------------------------
+
+    def _update_editor ( self, object, name, old_value, new_value ):
+        """ Handles the object trait changing, scheduling the editor to be
+            updated on the next tick of the event loop if the toolkit
+            coalesces updates.
+        """
+        if ((not self.coalesce_updates) or self._no_update or
+            (self.control is None) or (self.ui is None) or
+            (not toolkit().coalesce_updates)):
+            super( Editor, self )._update_editor( object, name, old_value,
+                                                  new_value )
+            return
+
+        # Let the base class log the change without updating the control (it
+        # skips the update while '_no_update' is set, as it does for changes
+        # made by the editor itself):
+        self._no_update = True
+        try:
+            super( Editor, self )._update_editor( object, name, old_value,
+                                                  new_value )
+        finally:
+            self._no_update = False
+
+        scheduler = getattr( self.ui, '_render_scheduler', None )
+        if scheduler is None:
+            scheduler = self.ui._render_scheduler = RenderScheduler()
+
+        scheduler.schedule( self )
+
     #---------------------------------------------------------------------------
     #  Updates the editor when the object trait changes external to the editor:
     #---------------------------------------------------------------------------
@@ -80,9 +266,34 @@ class Editor ( UIEditor ):
         """ Updates the editor when the object trait changes externally to the
             editor.
         """
-        new_value = self.str_value
-        if self.control.getText() != new_value:
-            self.control.setText( new_value )
+        self.set_text( self.str_value )
+
+    #---------------------------------------------------------------------------
+    #  Sets the text of the editor's control:
+    #---------------------------------------------------------------------------
+
+    def set_text ( self, text ):
+        """ Sets the text of the editor's control, unless it is already showing
+            that text.
+
+            The text last set is compared against rather than the control's
+            text, which would have to be read back from the DOM. Editors whose
+            control can be edited by the user must call **sync_text** when
+            its text is changed.
+        """
+        if text != self._shadow_text:
+            self.control.setText( text )
+            self._shadow_text = text
+
+    #---------------------------------------------------------------------------
+    #  Resynchronizes the shadow copy of the control's text:
+    #---------------------------------------------------------------------------
+
+    def sync_text ( self, text = None ):
+        """ Resynchronizes the copy of the control's text used by **set_text**
+            after the user has changed it (None if the new text is unknown).
+        """
+        self._shadow_text = text
 
     #---------------------------------------------------------------------------
     #  Handles an error that occurs while setting the object's trait value:
@@ -191,14 +402,7 @@ class Editor ( UIEditor ):
             control = [ control ]
 
         for item in control:
-            if state:
-                color = ErrorColor
-                if getattr( item, '_ok_color', None ) is None:
-                    item._ok_color = OKColor
-            else:
-                color = getattr( item, '_ok_color', OKColor )
-
-            item.setColor( color )
+            error_state_sheet.set_state( item, state )
 
     #---------------------------------------------------------------------------
     #  Handles the editor's invalid state changing:
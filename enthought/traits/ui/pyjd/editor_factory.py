@@ -78,8 +78,18 @@ class SimpleEditor ( Editor ):
             widget.
         """
         self.control = TextBox()
+        self.control.addChangeListener( self._text_changed )
         self.set_tooltip()
 
+    #---------------------------------------------------------------------------
+    #  Handles the user changing the contents of the text field:
+    #---------------------------------------------------------------------------
+
+    def _text_changed ( self, sender ):
+        """ Handles the user changing the contents of the text field.
+        """
+        self.sync_text()
+
     #---------------------------------------------------------------------------
     #  Invokes the pop-up editor for an object trait:
     #
@@ -110,7 +120,7 @@ class TextEditor ( Editor ):
         """
         self.control = TextBox()
 
-        self.control.setText( self.str_value )
+        self.set_text( self.str_value )
         self.control.addChangeListener( getattr( self, "update_object" ) )
         self.set_tooltip()
 
@@ -121,8 +131,10 @@ class TextEditor ( Editor ):
     def update_object( self, sender ):
         """ Handles the user changing the contents of the edit control.
         """
+        text = self.control.getText()
+        self.sync_text( text )
         try:
-            self.value = unicode( self.control.getText() )
+            self.value = unicode( text )
         except TraitError, excp:
             pass
 
@@ -163,9 +175,6 @@ class ReadonlyEditor ( Editor ):
         """ Updates the editor when the object trait changes externally to the
             editor.
         """
-        new_value = self.str_value
-
-        if self.control.getText() != new_value:
-            self.control.setText( new_value )
+        self.set_text( self.str_value )
 
 # EOF -------------------------------------------------------------------------
@@ -28,16 +28,24 @@
 #  Imports:
 #------------------------------------------------------------------------------
 
+from bisect \
+    import bisect_left
+
 from string \
     import capitalize
 
 from pyjamas.ui.ListBox import ListBox
+from pyjamas.ui.TextBox import TextBox
+from pyjamas.ui.Button import Button
+from pyjamas.ui.Label import Label
+from pyjamas.ui.VerticalPanel import VerticalPanel
+from pyjamas.ui.HorizontalPanel import HorizontalPanel
 from pyjamas.ui.Panel import Panel
 from pyjamas.ui.RadioButton import RadioButton
 from pyjamas.ui.FlexTable import FlexTable
 
 from enthought.traits.api \
-    import Bool, Property
+    import Bool, Int, Property
 
 # FIXME: ToolkitEditorFactory is a proxy class defined here just for backward
 # compatibility. The class has been moved to the
@@ -45,6 +53,9 @@ from enthought.traits.api \
 from enthought.traits.ui.editors.file_editor \
     import ToolkitEditorFactory
 
+from enthought.traits.ui.editors.enum_editor \
+    import ToolkitEditorFactory as EnumToolkitEditorFactory
+
 from editor \
     import Editor
 
@@ -75,6 +86,9 @@ class BaseEditor ( Editor ):
     # Current inverse mapping from values to names:
     inverse_mapping = Property
 
+    # Current mapping from names to their index in the set of names:
+    indices = Property
+
     #---------------------------------------------------------------------------
     #  Finishes initialising the editor by creating the underlying toolkit
     #  widget:
@@ -131,6 +145,23 @@ class BaseEditor ( Editor ):
 
         return self._inverse_mapping
 
+    #---------------------------------------------------------------------------
+    #  Gets the current mapping from names to indices:
+    #---------------------------------------------------------------------------
+
+    def _get_indices ( self ):
+        """ Gets the current mapping from names to indices.
+        """
+        names   = self.names
+        indices = self._indices
+        if (indices is None) or (indices[0] is not names):
+            # Index the first occurrence of each name:
+            n = len( names )
+            indices = self._indices = ( names, dict(
+                [ ( names[i], i ) for i in xrange( n - 1, -1, -1 ) ] ) )
+
+        return indices[1]
+
     #---------------------------------------------------------------------------
     #  Rebuilds the contents of the editor whenever the original factory
     #  object's 'values' trait changes:
@@ -152,6 +183,7 @@ class BaseEditor ( Editor ):
         """
         self._names, self._mapping, self._inverse_mapping = \
             enum_values_changed( self._value() )
+        self._indices = None
 
     #---------------------------------------------------------------------------
     #  Handles the underlying object model's enumeration set being changed:
@@ -202,6 +234,9 @@ class SimpleEditor ( BaseEditor ):
         for name in self.names:
             control.addItem(name)
 
+        # The names currently shown by the combo box:
+        self._shown = self.names
+
         self.control.addChangeListener( getattr(self, "update_object") )
 
         if self.factory.evaluate is not None:
@@ -279,7 +314,7 @@ class SimpleEditor ( BaseEditor ):
             self._no_enum_update += 1
             if self.factory.evaluate is None:
                 try:
-                    index = self.names.index(self.inverse_mapping[self.value])
+                    index = self.indices[self.inverse_mapping[self.value]]
                     self.control.setSelectedIndex(index)
                 except:
                     self.control.setSelectedIndex(-1)
@@ -309,12 +344,32 @@ class SimpleEditor ( BaseEditor ):
         """ Rebuilds the contents of the editor whenever the original factory
             object's **values** trait changes.
         """
-        self.control.blockSignals(True)
-        self.control.clear()
-        for name in self.names:
-            self.control.addItem(name)
-        self.control.blockSignals(False)
-
+        control = self.control
+        old = self._shown
+        new = self._shown = self.names
+
+        # Find the names that are unchanged at the start and end:
+        n = min(len(old), len(new))
+        start = 0
+        while (start < n) and (old[start] == new[start]):
+            start += 1
+
+        end = 0
+        n -= start
+        while (end < n) and (old[-end - 1] == new[-end - 1]):
+            end += 1
+
+        # Only replace the names in between, making sure the changes are not
+        # mistaken for the user selecting a new value:
+        self._no_enum_update += 1
+        for i in xrange(len(old) - end - 1, start - 1, -1):
+            control.removeItem(i)
+
+        for i in xrange(start, len(new) - end):
+            control.insertItem(new[i], new[i], i)
+        self._no_enum_update -= 1
+
+        # Restore the selection of the current value:
         self.update_editor()
 
 #-------------------------------------------------------------------------------
@@ -349,11 +404,11 @@ class RadioEditor ( BaseEditor ):
     #  Handles the user clicking one of the 'custom' radio buttons:
     #---------------------------------------------------------------------------
 
-    def update_object ( self, index ):
+    def update_object ( self, sender ):
         """ Handles the user clicking one of the custom radio buttons.
         """
         try:
-            self.value = self.mapping[ self.names[ index ] ]
+            self.value = self.mapping[ self._button_names[ id( sender ) ] ]
         except:
             pass
 
@@ -365,13 +420,18 @@ class RadioEditor ( BaseEditor ):
         """ Updates the editor when the object trait changes externally to the
             editor.
         """
-        table = self.control
-        value = self.value
+        checked = self._checked
+        if checked is not None:
+            checked.setChecked( False )
 
-        for row in range( table.getRowCount() ):
-            for cell in range( table.getCellCount( row ) ):
-                rb = table.getWidget( row, cell )
-                rb.setChecked( rb.getText == value )
+        try:
+            index   = self.indices[ self.inverse_mapping[ self.value ] ]
+            checked = self._buttons[ index ]
+            checked.setChecked( True )
+        except:
+            checked = None
+
+        self._checked = checked
 
     #---------------------------------------------------------------------------
     #  Rebuilds the contents of the editor whenever the original factory
@@ -385,6 +445,12 @@ class RadioEditor ( BaseEditor ):
         # Clear any existing content:
         self.control.clear()
 
+        # The buttons for each name (in the order of the names), the name of
+        # each button (by button id) and the button which is checked:
+        buttons = self._buttons = [ None ] * len( self.names )
+        by_id   = self._button_names = {}
+        self._checked = None
+
         # Get the current trait value:
         cur_name = self.str_value
 
@@ -411,9 +477,12 @@ class RadioEditor ( BaseEditor ):
                 if n > 0:
                     name = names[index]
                     rb = self.create_button(name)
-                    rb.setText = mapping[name]
+                    buttons[index] = rb
+                    by_id[id(rb)] = name
 
-                    rb.setChecked(name == cur_name)
+                    if name == cur_name:
+                        rb.setChecked(True)
+                        self._checked = rb
 
                     rb.addClickListener( getattr(self, "update_object") )
 
@@ -434,6 +503,252 @@ class RadioEditor ( BaseEditor ):
         return RadioButton( group=str( id( self ) ), label=label )
 
 
+#-------------------------------------------------------------------------------
+#  'PrefixIndex' class:
+#-------------------------------------------------------------------------------
+
+class PrefixIndex ( object ):
+    """ An index of a set of enumeration names, sorted case-insensitively, for
+        finding the names starting with a prefix.
+    """
+
+    def __init__ ( self, names ):
+        """ Initialise the object.
+        """
+        data = [ ( name.lower(), name ) for name in names ]
+        data.sort()
+
+        # The lower case names (in sorted order), for searching:
+        self.keys = [ key for key, name in data ]
+
+        # The names in sorted order:
+        self.names = [ name for key, name in data ]
+
+    def matches ( self, prefix ):
+        """ Returns the range of indices of the names starting with a prefix,
+            as a tuple of the form: ( first, last ), where last is the index
+            following the last match.
+        """
+        prefix = prefix.lower()
+        keys   = self.keys
+        first  = bisect_left( keys, prefix )
+        last   = first
+
+        # Find the end of the matches by searching for the first key which
+        # does not start with the prefix:
+        if prefix != '':
+            step = 1
+            while ((last + step) <= len( keys )) and \
+                  keys[ last + step - 1 ].startswith( prefix ):
+                last += step
+                step *= 2
+
+            while step > 0:
+                if ((last + step) <= len( keys )) and \
+                   keys[ last + step - 1 ].startswith( prefix ):
+                    last += step
+                step /= 2
+        else:
+            last = len( keys )
+
+        return ( first, last )
+
+#-------------------------------------------------------------------------------
+#  'TypeaheadEditor' class:
+#-------------------------------------------------------------------------------
+
+class TypeaheadEditor ( BaseEditor ):
+    """ Enumeration editor for very large sets of values, which only shows the
+        values starting with the text typed by the user, a page at a time.
+    """
+
+    #---------------------------------------------------------------------------
+    #  Finishes initializing the editor by creating the underlying toolkit
+    #  widget:
+    #---------------------------------------------------------------------------
+
+    def init ( self, parent ):
+        """ Finishes initializing the editor by creating the underlying toolkit
+            widget.
+        """
+        super( TypeaheadEditor, self ).init( parent )
+
+        self._index = None
+        self._first = self._last = self._page = 0
+        self._no_enum_update = 0
+
+        self._text = text = TextBox()
+        text.addKeyboardListener( self )
+
+        self._list = box = ListBox()
+        box.setVisibleItemCount( self.factory.page_size )
+        box.addChangeListener( self.update_object )
+
+        self._previous = Button( '<', self._on_previous )
+        self._next     = Button( '>', self._on_next )
+        self._status   = Label()
+
+        pager = HorizontalPanel()
+        pager.add( self._previous )
+        pager.add( self._status )
+        pager.add( self._next )
+
+        self.control = control = VerticalPanel()
+        control.add( text )
+        control.add( box )
+        control.add( pager )
+
+        self.set_tooltip( text )
+
+    #---------------------------------------------------------------------------
+    #  Handles the user selecting a value from the list of matches:
+    #---------------------------------------------------------------------------
+
+    def update_object ( self, sender = None ):
+        """ Handles the user selecting a value from the list of matches.
+        """
+        if self._no_enum_update == 0:
+            self._no_enum_update += 1
+            name = self._list.getSelectedItemText()
+            try:
+                self.value = self.mapping[ unicode( name ) ]
+                self._text.setText( name )
+            except:
+                pass
+            self._no_enum_update -= 1
+
+    #---------------------------------------------------------------------------
+    #  Updates the editor when the object trait changes external to the editor:
+    #---------------------------------------------------------------------------
+
+    def update_editor ( self ):
+        """ Updates the editor when the object trait changes externally to the
+            editor.
+        """
+        if self._no_enum_update == 0:
+            self._no_enum_update += 1
+            self._text.setText( self.inverse_mapping.get( self.value, '' ) )
+            self._filter()
+            self._no_enum_update -= 1
+
+    #---------------------------------------------------------------------------
+    #  Rebuilds the contents of the editor whenever the original factory
+    #  object's 'values' trait changes:
+    #---------------------------------------------------------------------------
+
+    def rebuild_editor ( self ):
+        """ Rebuilds the contents of the editor whenever the original factory
+            object's **values** trait changes.
+        """
+        self._index = None
+        self._filter( self._page )
+
+    #---------------------------------------------------------------------------
+    #  Handles the user typing into the text field:
+    #---------------------------------------------------------------------------
+
+    def onKeyDown ( self, sender, keyCode, modifiers ):
+        pass
+
+    def onKeyPress ( self, sender, keyCode, modifiers ):
+        pass
+
+    def onKeyUp ( self, sender, keyCode, modifiers ):
+        """ Shows the first page of values matching the text typed.
+        """
+        self._filter()
+
+    #---------------------------------------------------------------------------
+    #  Handles the user paging through the matches:
+    #---------------------------------------------------------------------------
+
+    def _on_previous ( self, sender ):
+        """ Shows the previous page of matches.
+        """
+        self._show( self._page - 1 )
+
+    def _on_next ( self, sender ):
+        """ Shows the next page of matches.
+        """
+        self._show( self._page + 1 )
+
+    #---------------------------------------------------------------------------
+    #  Shows the values matching the text typed:
+    #---------------------------------------------------------------------------
+
+    def _filter ( self, page = 0 ):
+        """ Finds the values matching the text typed and shows a page of them.
+        """
+        index = self._index
+        if (index is None) or (index[0] is not self.names):
+            index = self._index = ( self.names, PrefixIndex( self.names ) )
+
+        self._first, self._last = index[1].matches( self._text.getText() )
+        self._show( page )
+
+    def _show ( self, page ):
+        """ Shows a page of the current matches.
+        """
+        size  = self.factory.page_size
+        count = self._last - self._first
+        pages = max( 1, (count + size - 1) / size )
+        page  = self._page = max( 0, min( page, pages - 1 ) )
+
+        first = self._first + page * size
+        last  = min( self._last, first + size )
+        names = self._index[1].names
+
+        self._no_enum_update += 1
+        box = self._list
+        box.clear()
+        current = self.inverse_mapping.get( self.value )
+        for i in xrange( first, last ):
+            box.addItem( names[i] )
+            if names[i] == current:
+                box.setSelectedIndex( i - first )
+        self._no_enum_update -= 1
+
+        if count > 0:
+            self._status.setText( '%d-%d of %d' % ( first - self._first + 1,
+                                                    last - self._first,
+                                                    count ) )
+        else:
+            self._status.setText( 'No matches' )
+
+        self._previous.setEnabled( page > 0 )
+        self._next.setEnabled( page < (pages - 1) )
+
+#-------------------------------------------------------------------------------
+#  'TypeaheadEnumEditor' class:
+#-------------------------------------------------------------------------------
+
+class TypeaheadEnumEditor ( EnumToolkitEditorFactory ):
+    """ Editor factory for enumerations with very large sets of values, whose
+        simple and custom styles only show the values starting with the text
+        typed by the user, a page at a time.
+    """
+
+    #---------------------------------------------------------------------------
+    #  Trait definitions:
+    #---------------------------------------------------------------------------
+
+    # The number of matching values shown at a time:
+    page_size = Int( 20 )
+
+    #---------------------------------------------------------------------------
+    #  Editor methods:
+    #---------------------------------------------------------------------------
+
+    def simple_editor ( self, ui, object, name, description, parent ):
+        return TypeaheadEditor( parent,
+                                factory     = self,
+                                ui          = ui,
+                                object      = object,
+                                name        = name,
+                                description = description )
+
+    custom_editor = simple_editor
+
 #class SimpleEditor ( BaseEditor ):
 #    """ Simple style of enumeration editor, which displays a combo box.
 #    """
@@ -28,12 +28,41 @@
 #  Imports:
 #-------------------------------------------------------------------------------
 
+import re
+
+from opcode import opmap, HAVE_ARGUMENT
+
 from enthought.traits.api \
     import Enum, CTrait, BaseTraitHandler, TraitError
 
 from enthought.traits.ui.ui_traits \
     import convert_image, SequenceTypes
 
+#-------------------------------------------------------------------------------
+#  Constants:
+#-------------------------------------------------------------------------------
+
+# Pattern of a simple or dotted name (e.g. 'object' or 'object.sub'):
+dotted_name = re.compile( r'[A-Za-z_]\w*(\.[A-Za-z_]\w*)*$' )
+
+# Cache of compiled expressions, keyed by expression string:
+compiled_expressions = {}
+
+# Op codes of the byte code instructions which call a function or method:
+CallOps = frozenset( [ opmap[ name ] for name in (
+    'CALL_FUNCTION', 'CALL_FUNCTION_VAR', 'CALL_FUNCTION_KW',
+    'CALL_FUNCTION_VAR_KW' ) if name in opmap ] )
+
+# Maximum number of sets of enumeration values whose mappings are cached:
+EnumCacheSize = 64
+
+# Cache of enumeration mappings, keyed by the id of the enumeration values,
+# as tuples of the form: ( values, snapshot, names by value, mappings ):
+enum_mappings = {}
+
+# The ids of the cached enumeration values, oldest first:
+enum_order = []
+
 #-------------------------------------------------------------------------------
 #  Positions a window on the screen with a specified width and height so that
 #  the window completely fits on the screen if possible:
@@ -95,36 +124,199 @@ def position_window ( window, width = None, height = None, parent = None ):
 
 def enum_values_changed ( values ):
     """ Recomputes the mappings for a new set of enumeration values.
+
+        The result is cached by the identity of the values object, so that it
+        is shared by all editors of the same values, and must not be
+        modified. When the contents of the values change, only the names of
+        the new values are computed. Tuples of values are assumed to be
+        unchanged if they are the same object; the contents of other values
+        are compared with those cached.
     """
+    kind, snapshot = _enum_snapshot( values )
 
-    if isinstance( values, dict ):
-        data = [ ( str( v ), n ) for n, v in values.items() ]
+    entry = enum_mappings.get( id( values ) )
+    if (entry is not None) and (entry[0] is values):
+        if _same_snapshot( kind, entry[1], snapshot ):
+            return entry[3]
+
+        # Reuse the names of the values that are unchanged:
+        strings = entry[2]
+    else:
+        strings = {}
+
+    # The names are keyed by type as well, since values such as 1, 1.0 and
+    # True are equal but have different names:
+    new_strings = {}
+    def name_for ( value ):
+        try:
+            key  = ( type( value ), value )
+            name = strings.get( key )
+            if name is None:
+                name = str( value )
+            new_strings[ key ] = name
+        except TypeError:
+            # The value is not hashable:
+            name = str( value )
+
+        return name
+
+    if kind == 'dict':
+        data = [ ( name_for( v ), n ) for n, v in snapshot ]
         if len( data ) > 0:
-            data.sort( lambda x, y: cmp( x[0], y[0] ) )
+            data.sort( key = _enum_name )
             col = data[0][0].find( ':' ) + 1
             if col > 0:
                 data = [ ( n[ col: ], v ) for n, v in data ]
-    elif not isinstance( values, SequenceTypes ):
+    elif kind == 'mapped':
+        data = [ ( name_for( n ), n ) for n in snapshot ]
+        data.sort( key = _enum_name )
+    else:
+        data = [ ( name_for( v ), v ) for v in snapshot ]
+
+    names           = [ x[0] for x in data ]
+    mapping         = dict( data )
+    inverse_mapping = dict( [ ( value, name ) for name, value in data ] )
+    result          = ( names, mapping, inverse_mapping )
+
+    if id( values ) not in enum_mappings:
+        enum_order.append( id( values ) )
+        while len( enum_order ) > EnumCacheSize:
+            del enum_mappings[ enum_order.pop( 0 ) ]
+
+    enum_mappings[ id( values ) ] = ( values, snapshot, new_strings, result )
+
+    return result
+
+def _enum_name ( item ):
+    """ Returns the name of a ( name, value ) pair, for sorting by name.
+    """
+    return item[0]
+
+def _same_snapshot ( kind, old, new ):
+    """ Returns whether two snapshots of enumeration values are the same.
+    """
+    if old is new:
+        return True
+
+    if old != new:
+        return False
+
+    # Values which are equal but of different types (e.g. 1 and 1.0) have
+    # different names:
+    if kind == 'dict':
+        return ([ ( type( n ), type( v ) ) for n, v in old ] ==
+                [ ( type( n ), type( v ) ) for n, v in new ])
+
+    return [ type( v ) for v in old ] == [ type( v ) for v in new ]
+
+def _enum_snapshot ( values ):
+    """ Returns the kind of a set of enumeration values and a snapshot of its
+        contents, as a tuple of the form: ( kind, snapshot ). A tuple of
+        values is its own snapshot.
+    """
+    if isinstance( values, dict ):
+        return ( 'dict', values.items() )
+
+    if not isinstance( values, SequenceTypes ):
         handler = values
         if isinstance( handler, CTrait ):
             handler = handler.handler
         if not isinstance( handler, BaseTraitHandler ):
             raise TraitError, "Invalid value for 'values' specified"
         if handler.is_mapped:
-            data = [ ( str( n ), n ) for n in handler.map.keys() ]
-            data.sort( lambda x, y: cmp( x[0], y[0] ) )
+            return ( 'mapped', handler.map.keys() )
+
+        values = handler.values
+
+    if isinstance( values, tuple ):
+        return ( 'sequence', values )
+
+    return ( 'sequence', tuple( values ) )
+
+#-------------------------------------------------------------------------------
+#  Returns the compiled form of an expression:
+#-------------------------------------------------------------------------------
+
+def compile_expression ( expression ):
+    """ Returns the compiled form of an expression as a tuple of the form:
+        ( names, code ), where names is the list of names of a simple or
+        dotted name expression (or None) and code is the compiled code object.
+        Each expression string is only compiled once.
+    """
+    result = compiled_expressions.get( expression )
+    if result is None:
+        source = expression.strip()
+        names = None
+        if dotted_name.match( source ):
+            names = source.split( '.' )
+
+        result = compiled_expressions[ expression ] = \
+            ( names, compile( source, '<string>', 'eval' ) )
+
+    return result
+
+#-------------------------------------------------------------------------------
+#  Returns the names of the traits a compiled expression depends upon:
+#-------------------------------------------------------------------------------
+
+def expression_dependencies ( code, objects ):
+    """ Returns the names of the traits of a list of objects that the value of
+        a compiled expression depends upon, or None if it may depend upon any
+        of their traits. That is the case when the expression calls a function
+        or method, or reads a property whose dependencies are not declared,
+        since changes to what they read cannot be detected.
+    """
+    if has_calls( code ):
+        return None
+
+    names = code.co_names
+    for object in objects:
+        for name in names:
+            trait = object.trait( name )
+            if ((trait is not None) and (trait.type == 'property') and
+                (trait.depends_on is None)):
+                return None
+
+    return names
+
+def has_calls ( code ):
+    """ Returns whether a compiled expression calls a function or method.
+    """
+    bytes = code.co_code
+    i, n = 0, len( bytes )
+    while i < n:
+        op = ord( bytes[i] )
+        if op in CallOps:
+            return True
+
+        # Skip the instruction and its argument (if any):
+        i += 1
+        if op >= HAVE_ARGUMENT:
+            i += 2
+
+    return False
+
+#-------------------------------------------------------------------------------
+#  Evaluates an expression within a context:
+#-------------------------------------------------------------------------------
+
+def evaluate_expression ( expression, globals, context ):
+    """ Evaluates an expression within a context, as 'eval' would, but using
+        the cached compiled form of the expression. Simple and dotted names
+        found in the context are looked up directly without using 'eval'.
+    """
+    names, code = compile_expression( expression )
+    if names is not None:
+        try:
+            value = context[ names[0] ]
+        except KeyError:
+            pass
         else:
-            data = [ ( str( v ), v ) for v in handler.values ]
-    else:
-        data = [ ( str( v ), v ) for v in values ]
+            for name in names[1:]:
+                value = getattr( value, name )
 
-    names           = [ x[0] for x in data ]
-    mapping         = {}
-    inverse_mapping = {}
-    for name, value in data:
-        mapping[ name ] = value
-        inverse_mapping[ value ] = name
+            return value
 
-    return ( names, mapping, inverse_mapping )
+    return eval( code, globals, context )
 
 # EOF -------------------------------------------------------------------------
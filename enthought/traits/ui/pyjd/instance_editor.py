@@ -68,6 +68,9 @@ from constants \
 from helper \
     import position_window
 
+from ui_panel \
+    import retain_panel, release_panel
+
 #-------------------------------------------------------------------------------
 #  Constants:
 #-------------------------------------------------------------------------------
@@ -377,11 +380,15 @@ class CustomEditor ( Editor ):
         panel = self._panel
         if panel is not None:
             # Dispose of the previous contents of the panel:
+            retained = None
             layout = panel.layout()
             if layout is None:
                 layout = VerticalPanel()
 #                layout.setMargin(0)
             elif self._ui is not None:
+                # Keep the unchanged parts of the panel for the new view:
+                retained = self._ui
+                retain_panel( retained )
                 self._ui.dispose()
                 self._ui = None
             else:
@@ -418,6 +425,10 @@ class CustomEditor ( Editor ):
                 if view.resizable or view.scrollable or ui._scrollable:
                     stretch = 1
 
+            # Dispose of any retained parts the new content did not reuse:
+            if retained is not None:
+                release_panel( retained )
+
             # FIXME: Handle stretch.
             layout.add( control )
 
@@ -0,0 +1,400 @@
+#------------------------------------------------------------------------------
+#  Copyright (c) 2009, Richard Lincoln
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to
+#  deal in the Software without restriction, including without limitation the
+#  rights to use, copy, modify, merge, publish, distribute, sublicense, and/or
+#  sell copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in
+#  all copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+#  FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+#  IN THE SOFTWARE.
+#------------------------------------------------------------------------------
+
+""" Defines compiled layout plans for the groups of a View, so that the
+    structure of a View is only interpreted once however often it is shown.
+"""
+
+#------------------------------------------------------------------------------
+#  Imports:
+#------------------------------------------------------------------------------
+
+import re
+
+from weakref import WeakKeyDictionary
+
+from enthought.traits.ui.api import Group
+
+#------------------------------------------------------------------------------
+#  Constants:
+#------------------------------------------------------------------------------
+
+# Pattern of all digits
+all_digits = re.compile( r'\d+' )
+
+# Maximum number of layout plans kept in the plan cache:
+PlanCacheSize = 64
+
+# Maximum number of editor factories kept in the factory cache:
+FactoryCacheSize = 256
+
+# Item traits that determine the editor (and label) created for an Item:
+ItemSignature = ( 'id', 'name', 'object', 'style', 'editor', 'label',
+                  'show_label', 'tooltip', 'width', 'height', 'padding',
+                  'emphasized', 'has_focus', 'visible_when', 'enabled_when',
+                  'format_str', 'format_func', 'invalid' )
+
+# Group traits that determine the panel created for a Group:
+GroupSignature = ( 'id', 'label', 'orientation', 'layout', 'style',
+                   'show_border', 'show_labels', 'show_left', 'columns',
+                   'padding', 'visible_when', 'enabled_when' )
+
+#------------------------------------------------------------------------------
+#  Returns the View elements a group is made up of:
+#------------------------------------------------------------------------------
+
+def original_of ( value ):
+    """ Returns the original View element of a (shadow) Group or an Item.
+    """
+    return getattr( value, 'shadow', None ) or value
+
+def plan_elements ( group, elements = None ):
+    """ Returns the ids of the original View elements making up a (shadow)
+        group, in order, with None marking the end of each group's content.
+
+        The shadow groups created for a UI may leave out some of the content
+        of the original groups (e.g. items whose 'defined_when' is False), so
+        a plan compiled for one UI only suits another if both are made up of
+        the same elements.
+    """
+    if elements is None:
+        elements = []
+
+    elements.append( id( original_of( group ) ) )
+    for value in group.get_content():
+        if isinstance( value, Group ):
+            plan_elements( value, elements )
+        else:
+            elements.append( id( value ) )
+
+    elements.append( None )
+
+    return elements
+
+#------------------------------------------------------------------------------
+#  Returns the values of the traits a plan is compiled from:
+#------------------------------------------------------------------------------
+
+def item_values ( item ):
+    """ Returns the values of the traits of an Item which determine its
+        editor (and label).
+    """
+    return tuple( [ getattr( item, name ) for name in ItemSignature ] )
+
+def group_values ( group ):
+    """ Returns the values of the traits of a Group which determine its panel.
+    """
+    return tuple( [ getattr( group, name ) for name in GroupSignature ] )
+
+#------------------------------------------------------------------------------
+#  "ItemPlan" class:
+#------------------------------------------------------------------------------
+
+class ItemPlan ( object ):
+    """ The compiled layout information for a single Item.
+    """
+
+    # Item plans are never groups:
+    is_group = False
+
+    def __init__ ( self, item ):
+        """ Initialise the object.
+        """
+        self.item = item
+
+        # Classify the item from its name:
+        name = item.name
+        if name == '':
+            kind = 'label'
+        elif name == '_':
+            kind = 'separator'
+        elif (name == ' ') or all_digits.match( name ):
+            kind = 'spacer'
+            # Convert a blank to a 5 pixel spacer:
+            if name == ' ':
+                name = '5'
+        else:
+            kind = 'trait'
+
+        self.kind = kind
+        self.name = name
+
+        # The name of the editor factory method for the item's style:
+        self.factory_method = item.style + '_editor'
+
+        # The name the editor is bound to in the UIInfo object name space:
+        self.id = item.id or name
+
+        # The name of the handler method notified when the editor is created:
+        self.defined = self.id + '_defined'
+
+        # Items with the same signature have interchangeable editors:
+        self.signature = item_values( item )
+
+#------------------------------------------------------------------------------
+#  "GroupPlan" class:
+#------------------------------------------------------------------------------
+
+class GroupPlan ( object ):
+    """ The compiled layout information for a Group and all of its content.
+
+        A plan is shared by all UIs built from the same View, so it does not
+        refer to the (shadow) groups of any particular UI. Use 'bind' to pair
+        the plans of its content with the content of a UI's group.
+    """
+
+    # Group plans are always groups:
+    is_group = True
+
+    def __init__ ( self, group ):
+        """ Initialise the object.
+        """
+        content = group.get_content()
+
+        self.is_horizontal = (group.orientation == 'horizontal')
+
+        # The compiled plans for each Group or Item in the content:
+        self.content = [ plan_for_value( value ) for value in content ]
+
+        # Determine how the content is to be laid out:
+        if len( content ) == 0:
+            layout = 'empty'
+        elif group.layout in ( 'flow', 'split', 'tabbed', 'fold' ):
+            layout = group.layout
+        elif isinstance( content[0], Group ):
+            layout = 'groups'
+        else:
+            layout = 'items'
+
+        self.layout = layout
+
+        # See if a label is needed for any of the items:
+        show_labels = False
+        if layout == 'items':
+            for plan in self.content:
+                show_labels |= plan.item.show_label
+
+        self.show_labels = show_labels
+
+        # See if the visual appearance of the group is controlled:
+        self.is_conditional = ((group.visible_when != '') or
+                               (group.enabled_when != ''))
+
+        # Groups with the same signature have interchangeable panels:
+        self.signature = ( group_values( group ),
+                           tuple( [ plan.signature
+                                    for plan in self.content ] ) )
+
+    def bind ( self, group ):
+        """ Returns the content of a (shadow) group with the structure of the
+            plan as a list of ( plan, value ) pairs, where value is the Group
+            or Item of the group's content that the plan is for.
+        """
+        return zip( self.content, group.get_content() )
+
+#------------------------------------------------------------------------------
+#  "PlanCache" class:
+#------------------------------------------------------------------------------
+
+class PlanCache ( object ):
+    """ A least recently used cache of compiled group layout plans.
+
+        Plans are keyed by the identity of the original View group, and are
+        only reused for a (shadow) group made up of the same View elements.
+        Changing any trait of an element a plan was compiled from discards
+        all of the cached plans.
+    """
+
+    def __init__ ( self, size = PlanCacheSize ):
+        """ Initialise the object.
+        """
+        self.size = size
+
+        # The View elements whose changes are listened to:
+        self._watched = WeakKeyDictionary()
+
+        self.clear()
+
+    def get ( self, group ):
+        """ Returns the layout plan for a group, compiling it if needed.
+        """
+        original = original_of( group )
+        key      = id( original )
+        elements = plan_elements( group )
+
+        # Each entry has the form: ( original group, elements, plan ):
+        entry = self._plans.get( key )
+        if entry is not None:
+            self._order.remove( key )
+
+        if ((entry is not None) and (entry[0] is original) and
+            (entry[1] == elements)):
+            plan = entry[2]
+        else:
+            plan = GroupPlan( group )
+            self._plans[ key ] = ( original, elements, plan )
+            self._watch( group )
+
+        self._order.append( key )
+
+        # Evict the least recently used plans:
+        while len( self._order ) > self.size:
+            del self._plans[ self._order.pop( 0 ) ]
+
+        return plan
+
+    def clear ( self ):
+        """ Discards all cached layout plans.
+        """
+        self._plans = {}
+        self._order = []
+
+    def _watch ( self, group ):
+        """ Listens for changes to the original View elements of a group and
+            its content.
+        """
+        elements = [ original_of( group ) ]
+        for value in group.get_content():
+            if isinstance( value, Group ):
+                self._watch( value )
+            else:
+                elements.append( value )
+
+        for element in elements:
+            if element not in self._watched:
+                self._watched[ element ] = True
+                element.on_trait_change( self._element_changed )
+
+    def _element_changed ( self ):
+        """ Handles a trait of a View element changing, by discarding the
+            plans, which may have been compiled from it.
+        """
+        self.clear()
+
+# The shared layout plan cache:
+plan_cache = PlanCache()
+
+#------------------------------------------------------------------------------
+#  "FactoryCache" class:
+#------------------------------------------------------------------------------
+
+class FactoryCache ( object ):
+    """ A least recently used cache of the default editor factory of each
+        trait and its method for creating each style of editor.
+
+        The cache is keyed by the trait itself, since its default editor can
+        depend on how it was defined (e.g. the 'auto_set' and 'enter_set'
+        metadata of numeric traits), and redefining a trait creates a new one.
+    """
+
+    def __init__ ( self, size = FactoryCacheSize ):
+        """ Initialise the object.
+        """
+        self.size = size
+        self.clear()
+
+    def get ( self, trait, item, factory_method ):
+        """ Returns the default editor factory for an Item of a trait and its
+            method for creating the editor as a tuple of the form:
+            ( editor_factory, factory_method ).
+        """
+        key     = ( trait, factory_method )
+        methods = self._methods
+        result  = methods.get( key )
+        if result is not None:
+            self._order.remove( key )
+
+            # Don't use the cached factory if the trait has been given another
+            # editor since:
+            if result[2] is not trait.editor:
+                del methods[ key ]
+                result = None
+
+        if result is None:
+            editor_factory = trait.get_editor()
+            if editor_factory is None:
+                # If still no editor factory found, use a default text editor.
+                # It is not cached, since the settings of the Item are set in
+                # it below:
+                from text_editor import ToolkitEditorFactory
+                editor_factory = ToolkitEditorFactory()
+                result = ( editor_factory,
+                           getattr( editor_factory, factory_method ) )
+            else:
+                result = methods[ key ] = (
+                    editor_factory, getattr( editor_factory, factory_method ),
+                    trait.editor )
+
+        if key in methods:
+            self._order.append( key )
+
+            # Evict the least recently used factories:
+            while len( self._order ) > self.size:
+                del methods[ self._order.pop( 0 ) ]
+
+        editor_factory = result[0]
+
+        # If the item has formatting traits set them in the editor factory:
+        if item.format_func is not None:
+            editor_factory.format_func = item.format_func
+
+        if item.format_str != '':
+            editor_factory.format_str = item.format_str
+
+        # If the item has an invalid state extended trait name, set it in the
+        # editor factory:
+        if item.invalid != '':
+            editor_factory.invalid = item.invalid
+
+        return result[:2]
+
+    def clear ( self ):
+        """ Discards all cached editor factories.
+        """
+        self._methods = {}
+        self._order   = []
+
+# The shared editor factory cache:
+factory_cache = FactoryCache()
+
+#------------------------------------------------------------------------------
+#  Returns the layout plan for a top-level group:
+#------------------------------------------------------------------------------
+
+def plan_for ( group ):
+    """ Returns the (cached) layout plan for a top-level group.
+    """
+    return plan_cache.get( group )
+
+#------------------------------------------------------------------------------
+#  Returns the layout plan for a value of a group's content:
+#------------------------------------------------------------------------------
+
+def plan_for_value ( value ):
+    """ Returns the layout plan for a Group or Item of a group's content.
+    """
+    if isinstance( value, Group ):
+        return GroupPlan( value )
+
+    return ItemPlan( value )
+
+# EOF -------------------------------------------------------------------------
@@ -0,0 +1,129 @@
+#------------------------------------------------------------------------------
+#  Copyright (c) 2009, Richard Lincoln
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to
+#  deal in the Software without restriction, including without limitation the
+#  rights to use, copy, modify, merge, publish, distribute, sublicense, and/or
+#  sell copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in
+#  all copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+#  FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+#  IN THE SOFTWARE.
+#------------------------------------------------------------------------------
+
+
+""" Defines tests for the panel build profiler. """
+
+#------------------------------------------------------------------------------
+#  Imports:
+#------------------------------------------------------------------------------
+
+import json
+import unittest
+
+from enthought.traits.ui.pyjd.build_profiler \
+    import BuildProfiler, count_widgets
+
+#------------------------------------------------------------------------------
+#  "Panel" class:
+#------------------------------------------------------------------------------
+
+class Panel(object):
+    """ A stand-in for a Pyjamas panel, which iterates over its children. """
+
+    def __init__(self, *children):
+        self.children = list(children)
+
+    def __iter__(self):
+        return iter(self.children)
+
+#------------------------------------------------------------------------------
+#  "Widget" class:
+#------------------------------------------------------------------------------
+
+class Widget(object):
+    """ A stand-in for a Pyjamas widget without children. """
+
+#------------------------------------------------------------------------------
+#  "BuildProfilerTestCase" class:
+#------------------------------------------------------------------------------
+
+class BuildProfilerTestCase(unittest.TestCase):
+    """ Tests for the panel build profiler. """
+
+    #--------------------------------------------------------------------------
+    #  "TestCase" interface:
+    #--------------------------------------------------------------------------
+
+    def setUp(self):
+        """ Prepares the test fixture before each test method is called. """
+        self.profiler = BuildProfiler()
+        self.inner = Panel(Widget(), Widget())
+        self.outer = Panel(self.inner, Widget())
+
+    #--------------------------------------------------------------------------
+    #  Tests:
+    #--------------------------------------------------------------------------
+
+    def test_count_widgets(self):
+        """ Test counting the widgets of a tree of widgets. """
+        counts = {}
+        self.assertEqual(count_widgets(self.outer, counts), 5)
+        self.assertEqual(counts[id(self.inner)], 3)
+        self.assertEqual(count_widgets(None), 0)
+
+    def test_nested_spans(self):
+        """ Test that nested steps are recorded with their widget counts. """
+        profiler = self.profiler
+        group = profiler.begin("group", "outer")
+        items = profiler.begin("items", "inner")
+        profiler.end(items, self.inner)
+
+        # Widgets are only counted once the top-level step has ended:
+        self.assertEqual(items.widgets, 0)
+
+        profiler.end(group, self.outer)
+        self.assertEqual(profiler.spans, [group])
+        self.assertEqual(group.children, [items])
+        self.assertEqual((group.widgets, items.widgets), (5, 3))
+        self.assertTrue(group.duration >= items.duration >= 0.0)
+
+    def test_end_finishes_unfinished_spans(self):
+        """ Test that ending a step ends the unfinished steps within it. """
+        profiler = self.profiler
+        group = profiler.begin("group")
+        init = profiler.begin("init")
+        profiler.end(group)
+        self.assertTrue(init.duration is not None)
+
+    def test_report_and_trace(self):
+        """ Test the tree report and the Chrome trace of the steps. """
+        profiler = self.profiler
+        group = profiler.begin("group", "outer")
+        profiler.end(profiler.begin("items", "inner"), self.inner)
+        profiler.end(group, self.outer)
+
+        lines = profiler.report().split("\n")
+        self.assertEqual(len(lines), 3)
+        self.assertTrue(lines[1].endswith("group outer"))
+        self.assertTrue(lines[2].endswith("  items inner"))
+
+        events = json.loads(profiler.chrome_trace())["traceEvents"]
+        self.assertEqual([event["name"] for event in events],
+                         ["outer", "inner"])
+        self.assertEqual(events[1]["args"]["widgets"], 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
+
+# EOF -------------------------------------------------------------------------
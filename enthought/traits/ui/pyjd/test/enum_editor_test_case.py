@@ -0,0 +1,90 @@
+#------------------------------------------------------------------------------
+#  Copyright (c) 2009, Richard Lincoln
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to
+#  deal in the Software without restriction, including without limitation the
+#  rights to use, copy, modify, merge, publish, distribute, sublicense, and/or
+#  sell copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in
+#  all copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+#  FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+#  IN THE SOFTWARE.
+#------------------------------------------------------------------------------
+
+""" Defines tests for the enumeration editors. """
+
+#------------------------------------------------------------------------------
+#  Imports:
+#------------------------------------------------------------------------------
+
+import unittest
+
+from enthought.traits.ui.pyjd.enum_editor import PrefixIndex
+
+#------------------------------------------------------------------------------
+#  "PrefixIndexTestCase" class:
+#------------------------------------------------------------------------------
+
+class PrefixIndexTestCase(unittest.TestCase):
+    """ Tests for the index of enumeration names by prefix. """
+
+    #--------------------------------------------------------------------------
+    #  "TestCase" interface:
+    #--------------------------------------------------------------------------
+
+    def setUp(self):
+        """ Prepares the test fixture before each test method is called. """
+        self.index = PrefixIndex(["banana", "Apple", "apricot", "cherry",
+                                  "avocado"])
+
+    def matching(self, prefix):
+        first, last = self.index.matches(prefix)
+        return self.index.names[first:last]
+
+    #--------------------------------------------------------------------------
+    #  Tests:
+    #--------------------------------------------------------------------------
+
+    def test_names_are_sorted(self):
+        """ Test that the names are sorted case-insensitively. """
+        self.assertEqual(self.index.names,
+                         ["Apple", "apricot", "avocado", "banana", "cherry"])
+
+    def test_prefix(self):
+        """ Test finding the names starting with a prefix. """
+        self.assertEqual(self.matching("ap"), ["Apple", "apricot"])
+        self.assertEqual(self.matching("a"), ["Apple", "apricot", "avocado"])
+
+    def test_prefix_case(self):
+        """ Test that prefixes are matched case-insensitively. """
+        self.assertEqual(self.matching("CH"), ["cherry"])
+
+    def test_no_match(self):
+        """ Test a prefix which no name starts with. """
+        self.assertEqual(self.matching("d"), [])
+        self.assertEqual(self.matching("az"), [])
+
+    def test_empty_prefix(self):
+        """ Test that every name starts with an empty prefix. """
+        self.assertEqual(self.matching(""), self.index.names)
+
+    def test_many_matches(self):
+        """ Test finding a long run of matching names. """
+        index = PrefixIndex(["x%03d" % i for i in range(100)] + ["y"])
+        self.assertEqual(index.matches("x"), (0, 100))
+        self.assertEqual(index.matches("x05"), (50, 60))
+
+
+if __name__ == "__main__":
+    unittest.main()
+
+# EOF -------------------------------------------------------------------------
@@ -0,0 +1,229 @@
+#------------------------------------------------------------------------------
+#  Copyright (c) 2009, Richard Lincoln
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to
+#  deal in the Software without restriction, including without limitation the
+#  rights to use, copy, modify, merge, publish, distribute, sublicense, and/or
+#  sell copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in
+#  all copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+#  FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+#  IN THE SOFTWARE.
+#------------------------------------------------------------------------------
+
+
+""" Defines tests for the helper functions of the Pyjamas backend. """
+
+#------------------------------------------------------------------------------
+#  Imports:
+#------------------------------------------------------------------------------
+
+import unittest
+
+from enthought.traits.api import HasTraits, Int, Property
+
+from enthought.traits.ui.pyjd.helper import compile_expression, \
+    evaluate_expression, expression_dependencies, enum_values_changed
+
+#------------------------------------------------------------------------------
+#  "Model" class:
+#------------------------------------------------------------------------------
+
+class Model(HasTraits):
+    """ A model whose traits conditions depend upon. """
+
+    count = Int
+
+    # A property whose dependencies are declared:
+    double = Property(depends_on="count")
+
+    # A property whose dependencies are not declared:
+    half = Property
+
+    def _get_double(self):
+        return 2 * self.count
+
+    def _get_half(self):
+        return self.count / 2
+
+    def is_ready(self):
+        return self.count > 0
+
+#------------------------------------------------------------------------------
+#  "CompileExpressionTestCase" class:
+#------------------------------------------------------------------------------
+
+class CompileExpressionTestCase(unittest.TestCase):
+    """ Tests for the cached compiled form of expressions. """
+
+    #--------------------------------------------------------------------------
+    #  Tests:
+    #--------------------------------------------------------------------------
+
+    def test_expression_is_compiled_once(self):
+        """ Test that the same expression is only compiled once. """
+        self.assertTrue(compile_expression("count + 1") is
+                        compile_expression("count + 1"))
+
+    def test_dotted_name(self):
+        """ Test that the names of a dotted name expression are found. """
+        names, code = compile_expression(" object.count ")
+        self.assertEqual(names, ["object", "count"])
+
+    def test_other_expression(self):
+        """ Test that other expressions have no names. """
+        names, code = compile_expression("object.count + 1")
+        self.assertEqual(names, None)
+        self.assertEqual(eval(code, {}, {"object": Model(count=2)}), 3)
+
+#------------------------------------------------------------------------------
+#  "EvaluateExpressionTestCase" class:
+#------------------------------------------------------------------------------
+
+class EvaluateExpressionTestCase(unittest.TestCase):
+    """ Tests for evaluating expressions within a context. """
+
+    #--------------------------------------------------------------------------
+    #  "TestCase" interface:
+    #--------------------------------------------------------------------------
+
+    def setUp(self):
+        """ Prepares the test fixture before each test method is called. """
+        self.context = {"object": Model(count=4)}
+
+    def evaluate(self, expression):
+        return evaluate_expression(expression, {"len": len}, self.context)
+
+    #--------------------------------------------------------------------------
+    #  Tests:
+    #--------------------------------------------------------------------------
+
+    def test_name(self):
+        """ Test evaluating a name in the context. """
+        self.assertTrue(self.evaluate("object") is self.context["object"])
+
+    def test_dotted_name(self):
+        """ Test evaluating a dotted name in the context. """
+        self.assertEqual(self.evaluate("object.double"), 8)
+
+    def test_name_not_in_context(self):
+        """ Test that a name not in the context is looked up in the globals.
+        """
+        self.assertTrue(self.evaluate("len") is len)
+
+    def test_expression(self):
+        """ Test evaluating an expression calling a method. """
+        self.assertTrue(self.evaluate("object.is_ready() and object.half"))
+
+    def test_missing_attribute(self):
+        """ Test that a missing attribute raises an error, as for 'eval'. """
+        self.assertRaises(AttributeError, self.evaluate, "object.missing")
+
+#------------------------------------------------------------------------------
+#  "ExpressionDependenciesTestCase" class:
+#------------------------------------------------------------------------------
+
+class ExpressionDependenciesTestCase(unittest.TestCase):
+    """ Tests for finding the traits a condition depends upon. """
+
+    #--------------------------------------------------------------------------
+    #  "TestCase" interface:
+    #--------------------------------------------------------------------------
+
+    def setUp(self):
+        """ Prepares the test fixture before each test method is called. """
+        self.objects = [Model()]
+
+    def dependencies(self, expression):
+        names, code = compile_expression(expression)
+        return expression_dependencies(code, self.objects)
+
+    #--------------------------------------------------------------------------
+    #  Tests:
+    #--------------------------------------------------------------------------
+
+    def test_names(self):
+        """ Test that a condition depends upon the names it reads. """
+        self.assertEqual(set(self.dependencies("count > 3 and double")),
+                         set(["count", "double"]))
+
+    def test_method_call(self):
+        """ Test that a condition calling a method depends on anything. """
+        self.assertEqual(self.dependencies("object.is_ready()"), None)
+
+    def test_function_call(self):
+        """ Test that a condition calling a function depends on anything. """
+        self.assertEqual(self.dependencies("len(str(count)) > 1"), None)
+
+    def test_undeclared_property(self):
+        """ Test that a condition reading a property without declared
+            dependencies depends on anything.
+        """
+        self.assertEqual(self.dependencies("half > 1"), None)
+
+#------------------------------------------------------------------------------
+#  "EnumValuesChangedTestCase" class:
+#------------------------------------------------------------------------------
+
+class EnumValuesChangedTestCase(unittest.TestCase):
+    """ Tests for the cached mappings of enumeration values. """
+
+    #--------------------------------------------------------------------------
+    #  Tests:
+    #--------------------------------------------------------------------------
+
+    def test_sequence(self):
+        """ Test the mappings of a sequence of values. """
+        names, mapping, inverse = enum_values_changed(["a", 2])
+        self.assertEqual(names, ["a", "2"])
+        self.assertEqual(mapping, {"a": "a", "2": 2})
+        self.assertEqual(inverse, {"a": "a", 2: "2"})
+
+    def test_dict(self):
+        """ Test that the names of a dict of values are sorted, and stripped
+            of any ordering prefix.
+        """
+        names, mapping, inverse = enum_values_changed({1: "2:two",
+                                                       2: "1:one"})
+        self.assertEqual(names, ["one", "two"])
+        self.assertEqual(mapping, {"one": 2, "two": 1})
+
+    def test_result_is_cached(self):
+        """ Test that the mappings of the same values are shared. """
+        values = ("a", "b")
+        self.assertTrue(enum_values_changed(values) is
+                        enum_values_changed(values))
+
+    def test_changed_values(self):
+        """ Test that changing the contents of the values is seen. """
+        values = ["a", "b"]
+        enum_values_changed(values)
+        values.append("c")
+        names, mapping, inverse = enum_values_changed(values)
+        self.assertEqual(names, ["a", "b", "c"])
+
+    def test_equal_values_of_other_types(self):
+        """ Test that a changed value equal to the value it replaces, but of
+            another type, gets a name of its own.
+        """
+        values = [1, "x"]
+        enum_values_changed(values)
+        values[0] = 1.0
+        names, mapping, inverse = enum_values_changed(values)
+        self.assertEqual(names, ["1.0", "x"])
+        self.assertTrue(isinstance(mapping["1.0"], float))
+
+
+if __name__ == "__main__":
+    unittest.main()
+
+# EOF -------------------------------------------------------------------------
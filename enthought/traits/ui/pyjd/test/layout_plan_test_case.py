@@ -0,0 +1,213 @@
+#------------------------------------------------------------------------------
+#  Copyright (c) 2009, Richard Lincoln
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to
+#  deal in the Software without restriction, including without limitation the
+#  rights to use, copy, modify, merge, publish, distribute, sublicense, and/or
+#  sell copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in
+#  all copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+#  FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+#  IN THE SOFTWARE.
+#------------------------------------------------------------------------------
+
+""" Defines tests for the compiled layout plans. """
+
+#------------------------------------------------------------------------------
+#  Imports:
+#------------------------------------------------------------------------------
+
+import unittest
+
+from enthought.traits.api import HasTraits, Float, Int, Instance
+from enthought.traits.ui.api import Group, Item
+
+from enthought.traits.ui.pyjd.layout_plan import PlanCache, FactoryCache
+
+#------------------------------------------------------------------------------
+#  "ContentGroup" class:
+#------------------------------------------------------------------------------
+
+class ContentGroup(Group):
+    """ A Group which returns its content as is, like the shadow groups
+        created for a UI.
+    """
+
+    def get_content(self):
+        return self.content
+
+#------------------------------------------------------------------------------
+#  "ShadowGroup" class:
+#------------------------------------------------------------------------------
+
+class ShadowGroup(ContentGroup):
+    """ A group standing in for the shadow of an original group created for
+        a UI.
+    """
+
+    shadow = Instance(Group)
+
+#------------------------------------------------------------------------------
+#  "PlanCacheTestCase" class:
+#------------------------------------------------------------------------------
+
+class PlanCacheTestCase(unittest.TestCase):
+    """ Tests for the layout plan cache. """
+
+    #--------------------------------------------------------------------------
+    #  "TestCase" interface:
+    #--------------------------------------------------------------------------
+
+    def setUp(self):
+        """ Prepares the test fixture before each test method is called. """
+        self.cache = PlanCache(size=2)
+        self.items = [Item("name"), Item("age")]
+        self.group = ContentGroup(*self.items)
+
+    #--------------------------------------------------------------------------
+    #  Tests:
+    #--------------------------------------------------------------------------
+
+    def test_plan_is_reused(self):
+        """ Test that a group's plan is only compiled once. """
+        plan = self.cache.get(self.group)
+        self.assertTrue(self.cache.get(self.group) is plan)
+        self.assertEqual([p.name for p in plan.content], ["name", "age"])
+
+    def test_changed_group_gets_new_plan(self):
+        """ Test that changing a group after it was compiled is seen. """
+        plan = self.cache.get(self.group)
+        self.group.orientation = "horizontal"
+        new_plan = self.cache.get(self.group)
+        self.assertFalse(new_plan is plan)
+        self.assertTrue(new_plan.is_horizontal)
+
+    def test_changed_item_gets_new_plan(self):
+        """ Test that changing an item after it was compiled is seen. """
+        plan = self.cache.get(self.group)
+        self.items[0].style = "readonly"
+        new_plan = self.cache.get(self.group)
+        self.assertFalse(new_plan is plan)
+        self.assertEqual(new_plan.content[0].factory_method,
+                         "readonly_editor")
+
+    def test_changed_content_gets_new_plan(self):
+        """ Test that adding to the content of a group is seen. """
+        plan = self.cache.get(self.group)
+        self.group.content.append(Item("weight"))
+        new_plan = self.cache.get(self.group)
+        self.assertFalse(new_plan is plan)
+        self.assertEqual(len(new_plan.content), 3)
+
+    def test_shadow_groups_share_plan(self):
+        """ Test that the shadows of a group with the same elements share a
+            plan, and that one leaving out an element does not.
+        """
+        first = ShadowGroup(*self.items, shadow=self.group)
+        plan = self.cache.get(first)
+        second = ShadowGroup(*self.items, shadow=self.group)
+        self.assertTrue(self.cache.get(second) is plan)
+
+        fewer = ShadowGroup(self.items[0], shadow=self.group)
+        self.assertFalse(self.cache.get(fewer) is plan)
+
+    def test_plan_does_not_keep_group(self):
+        """ Test that a plan is bound to the group of each UI. """
+        plan = self.cache.get(self.group)
+        self.assertFalse(hasattr(plan, "group"))
+
+        other = ContentGroup(*self.items)
+        self.assertEqual([value for p, value in plan.bind(other)],
+                         self.items)
+
+    def test_least_recently_used_plan_is_evicted(self):
+        """ Test that the cache only keeps its most recently used plans. """
+        groups = [ContentGroup(Item("name%d" % i)) for i in range(3)]
+        plans = [self.cache.get(group) for group in groups]
+        self.assertTrue(self.cache.get(groups[2]) is plans[2])
+        self.assertFalse(self.cache.get(groups[0]) is plans[0])
+
+#------------------------------------------------------------------------------
+#  "Model" class:
+#------------------------------------------------------------------------------
+
+class Model(HasTraits):
+    """ A model with numeric traits whose default editors differ. """
+
+    plain = Float
+
+    entered = Float(enter_set=True)
+
+    manual = Int(auto_set=False)
+
+#------------------------------------------------------------------------------
+#  "FactoryCacheTestCase" class:
+#------------------------------------------------------------------------------
+
+class FactoryCacheTestCase(unittest.TestCase):
+    """ Tests for the default editor factory cache. """
+
+    #--------------------------------------------------------------------------
+    #  "TestCase" interface:
+    #--------------------------------------------------------------------------
+
+    def setUp(self):
+        """ Prepares the test fixture before each test method is called. """
+        self.cache = FactoryCache()
+        self.model = Model()
+
+    def factory(self, name):
+        trait = self.model.base_trait(name)
+        factory, method = self.cache.get(trait, Item(name), "simple_editor")
+        return factory
+
+    #--------------------------------------------------------------------------
+    #  Tests:
+    #--------------------------------------------------------------------------
+
+    def test_factory_is_cached(self):
+        """ Test that a trait's factory is only resolved once. """
+        self.assertTrue(self.factory("plain") is self.factory("plain"))
+
+    def test_trait_metadata_is_respected(self):
+        """ Test that traits of the same type with different 'auto_set' or
+            'enter_set' metadata get their own factories.
+        """
+        plain = self.factory("plain")
+        entered = self.factory("entered")
+        self.assertFalse(plain is entered)
+        self.assertFalse(plain.enter_set)
+        self.assertTrue(entered.enter_set)
+        self.assertFalse(self.factory("manual").auto_set)
+
+    def test_least_recently_used_factory_is_evicted(self):
+        """ Test that the cache only keeps its most recently used factories.
+        """
+        self.cache = FactoryCache(size=1)
+        plain = self.factory("plain")
+        self.factory("entered")
+        self.assertEqual(len(self.cache._methods), 1)
+        self.assertFalse(self.factory("plain") is plain)
+
+    def test_redefined_trait(self):
+        """ Test that a redefined trait does not get a stale factory. """
+        plain = self.factory("plain")
+        self.model.add_trait("plain", Float(enter_set=True))
+        factory = self.factory("plain")
+        self.assertFalse(factory is plain)
+        self.assertTrue(factory.enter_set)
+
+
+if __name__ == "__main__":
+    unittest.main()
+
+# EOF -------------------------------------------------------------------------
@@ -0,0 +1,94 @@
+#------------------------------------------------------------------------------
+#  Copyright (c) 2009, Richard Lincoln
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to
+#  deal in the Software without restriction, including without limitation the
+#  rights to use, copy, modify, merge, publish, distribute, sublicense, and/or
+#  sell copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in
+#  all copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+#  FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+#  IN THE SOFTWARE.
+#------------------------------------------------------------------------------
+
+""" Defines tests for the read-only text views for large texts. """
+
+#------------------------------------------------------------------------------
+#  Imports:
+#------------------------------------------------------------------------------
+
+import unittest
+
+from enthought.traits.ui.pyjd.text_window import LineIndex
+
+#------------------------------------------------------------------------------
+#  "LineIndexTestCase" class:
+#------------------------------------------------------------------------------
+
+class LineIndexTestCase(unittest.TestCase):
+    """ Tests for the index of the lines of a text. """
+
+    #--------------------------------------------------------------------------
+    #  "TestCase" interface:
+    #--------------------------------------------------------------------------
+
+    def setUp(self):
+        """ Prepares the test fixture before each test method is called. """
+        self.index = LineIndex()
+        self.index.set_text("one\ntwo\nthree")
+
+    #--------------------------------------------------------------------------
+    #  Tests:
+    #--------------------------------------------------------------------------
+
+    def test_count(self):
+        """ Test that the lines of the text are counted. """
+        self.assertEqual(self.index.count, 3)
+
+    def test_lines(self):
+        """ Test getting the text of a range of lines. """
+        self.assertEqual(self.index.lines(0, 1), "one")
+        self.assertEqual(self.index.lines(1, 3), "two\nthree")
+        self.assertEqual(self.index.lines(0, 3), "one\ntwo\nthree")
+
+    def test_offsets_are_built_lazily(self):
+        """ Test that only the lines asked for are indexed. """
+        self.assertEqual(self.index.offsets, [0])
+        self.assertEqual(self.index.offset(1), 4)
+        self.assertEqual(self.index.offsets, [0, 4])
+
+    def test_offset_past_end(self):
+        """ Test the offset of a line past the end of the text. """
+        self.assertEqual(self.index.offset(5), len("one\ntwo\nthree"))
+
+    def test_appended_text(self):
+        """ Test that appending to the text keeps the indexed lines. """
+        self.index.offset(2)
+        offsets = self.index.offsets
+        self.index.set_text("one\ntwo\nthree\nfour")
+        self.assertTrue(self.index.offsets is offsets)
+        self.assertEqual(self.index.count, 4)
+        self.assertEqual(self.index.lines(2, 4), "three\nfour")
+
+    def test_replaced_text(self):
+        """ Test that replacing the text indexes it again. """
+        self.index.offset(2)
+        self.index.set_text("a\nb")
+        self.assertEqual(self.index.offsets, [0])
+        self.assertEqual(self.index.count, 2)
+        self.assertEqual(self.index.lines(1, 2), "b")
+
+
+if __name__ == "__main__":
+    unittest.main()
+
+# EOF -------------------------------------------------------------------------
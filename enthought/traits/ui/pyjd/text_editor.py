@@ -29,13 +29,19 @@
 #------------------------------------------------------------------------------
 
 import logging
+import time
+
+from pyjamas.Timer import Timer
 
 from pyjamas.ui.TextBox import TextBox
 from pyjamas.ui.TextArea import TextArea
 from pyjamas.ui.PasswordTextBox import PasswordTextBox
 
 from enthought.traits.api \
-    import TraitError
+    import TraitError, Either, Int
+
+from enthought.traits.ui.toolkit \
+    import toolkit
 
 # FIXME: ToolkitEditorFactory is a proxy class defined here just for backward
 # compatibility. The class has been moved to the
@@ -49,6 +55,9 @@ from editor \
 from editor_factory \
     import ReadonlyEditor as BaseReadonlyEditor
 
+from text_window \
+    import TextWindow, TextStream
+
 from constants \
     import OKColor, ErrorColor
 
@@ -66,6 +75,102 @@ logger = logging.getLogger( __name__ )
 HoverColor = "Grey"
 DownColor  = "White"
 
+#-------------------------------------------------------------------------------
+#  '_PendingValues' class:
+#-------------------------------------------------------------------------------
+
+class _PendingValues ( object ):
+    """ The values typed into 'auto_set' text editors of the same object that
+        are waiting to be assigned. They are assigned together, either once
+        typing has paused or when any of them is committed.
+    """
+
+    # Mapping of object id to the pending values of the object:
+    pending = {}
+
+    def __init__ ( self, object ):
+        """ Initialise the object.
+        """
+        self.object = object
+
+        # The editors with a pending value, in the order they were changed:
+        self.editors = []
+
+        # The time the first value became pending:
+        self.start = time.time()
+
+        self.timer = Timer( notify = self._on_timer )
+
+    @classmethod
+    def add ( cls, editor, delay, max_wait ):
+        """ Adds the value of an editor to the pending values of its object,
+            (re)starting the delay before they are assigned.
+        """
+        object = editor.object
+        values = cls.pending.get( id( object ) )
+        if values is None:
+            values = cls.pending[ id( object ) ] = cls( object )
+
+        if editor not in values.editors:
+            values.editors.append( editor )
+
+        # Don't hold the values back for longer than the maximum wait:
+        if max_wait >= 0:
+            waited = int( (time.time() - values.start) * 1000 )
+            delay  = max( 0, min( delay, max_wait - waited ) )
+
+        values.timer.cancel()
+        values.timer.schedule( delay )
+
+    @classmethod
+    def flush ( cls, object ):
+        """ Assigns the pending values of an object (if any) and returns the
+            editors whose values were assigned.
+        """
+        values = cls.pending.pop( id( object ), None )
+        if values is None:
+            return []
+
+        values.timer.cancel()
+        for editor in values.editors:
+            editor._assign_value()
+
+        return values.editors
+
+    def _on_timer ( self, timer ):
+        """ Handles the delay expiring.
+        """
+        if _PendingValues.pending.get( id( self.object ) ) is self:
+            _PendingValues.flush( self.object )
+
+#-------------------------------------------------------------------------------
+#  '_AutoSetListener' class:
+#-------------------------------------------------------------------------------
+
+class _AutoSetListener ( object ):
+    """ Keyboard listener making the value typed into a text editor pending.
+    """
+
+    def __init__ ( self, editor, delay, max_wait ):
+        """ Initialise the object.
+        """
+        self.editor   = editor
+        self.delay    = delay
+        self.max_wait = max_wait
+
+    def onKeyDown ( self, sender, keyCode, modifiers ):
+        pass
+
+    def onKeyPress ( self, sender, keyCode, modifiers ):
+        pass
+
+    def onKeyUp ( self, sender, keyCode, modifiers ):
+        """ Handles a key being released in the text field.
+        """
+        editor = self.editor
+        if (not editor._no_update) and (editor.control is not None):
+            _PendingValues.add( editor, self.delay, self.max_wait )
+
 #-------------------------------------------------------------------------------
 #  'SimpleEditor' class:
 #-------------------------------------------------------------------------------
@@ -118,8 +223,21 @@ class SimpleEditor ( Editor ):
 
         control.addChangeListener( self.update_object )
 
-#        if factory.auto_set:
-#           control.addKeyboadListener( self.update_object )
+        # Assign the value while the user is typing, once typing pauses (using
+        # the delays of a DelayedTextEditor factory, if set):
+        if factory.auto_set:
+            tk = toolkit()
+            delay = getattr( factory, 'auto_set_delay', None )
+            if delay is None:
+                delay = tk.text_auto_set_delay
+
+            max_wait = getattr( factory, 'auto_set_max_wait', None )
+            if max_wait is None:
+                max_wait = tk.text_auto_set_max_wait
+
+            if delay > 0:
+                control.addKeyboardListener(
+                    _AutoSetListener( self, delay, max_wait ) )
 
 #        parent.add(control)
         self.control = control
@@ -132,6 +250,17 @@ class SimpleEditor ( Editor ):
     def update_object ( self, event ):
         """ Handles the user entering input data in the edit control.
         """
+        # Assign any values pending for the object along with this one:
+        if self not in _PendingValues.flush( self.object ):
+            self._assign_value()
+
+    #--------------------------------------------------------------------------
+    #  Assigns the value typed into the edit control to the object trait:
+    #--------------------------------------------------------------------------
+
+    def _assign_value ( self ):
+        """ Assigns the value typed into the edit control to the object trait.
+        """
         if (not self._no_update) and (self.control is not None):
             try:
                 self.value = self._get_user_value()
@@ -178,13 +307,25 @@ class SimpleEditor ( Editor ):
     def _get_user_value ( self ):
         """ Gets the actual value corresponding to what the user typed.
         """
-        value = self.control.getText()
-        try:
-            value = self.evaluate( value )
-        except:
-            logger.exception( 'Could not evaluate %r in TextEditor' %
-                              ( value, ) )
+        text     = self.control.getText()
+        evaluate = self.evaluate
+
+        # Reuse the value evaluated from the same text by the same function
+        # last time (if any):
+        memo = self._user_value
+        if (memo is not None) and (memo[0] == text) and (memo[1] == evaluate):
+            value = memo[2]
+        else:
+            value = text
+            try:
+                value = evaluate( value )
+            except:
+                logger.exception( 'Could not evaluate %r in TextEditor' %
+                                  ( value, ) )
+
+            self._user_value = ( text, evaluate, value )
 
+        # The mapping is looked up every time, as it may have changed:
         try:
             ret = self.factory.mapping.get( value, value )
         except TypeError:
@@ -235,6 +376,41 @@ class ReadonlyEditor ( BaseReadonlyEditor ):
     """ Read-only style of text editor, which displays a read-only text field.
     """
 
+    #---------------------------------------------------------------------------
+    #  Finishes initializing the editor by creating the underlying toolkit
+    #  widget:
+    #---------------------------------------------------------------------------
+
+    def init ( self, parent ):
+        """ Finishes initializing the editor by creating the underlying toolkit
+            widget.
+        """
+        tk = toolkit()
+        factory = self.factory
+        multi_line = ((not factory.password) and
+            ((self.item.resizable is True) or (self.item.height != -1.0)))
+
+        streaming = (isinstance( factory, StreamingTextEditor ) or
+                     tk.text_streaming)
+
+        if multi_line and streaming:
+            # Only add the text appended to the text already shown (up to the
+            # line limit of a StreamingTextEditor factory, if set):
+            max_lines = getattr( factory, 'max_lines', None )
+            if max_lines is None:
+                max_lines = tk.text_stream_max_lines
+
+            self.control = TextStream( max_lines, tk.text_stream_height )
+            self.set_tooltip()
+        elif multi_line and tk.virtual_text:
+            # Only render the lines of the text near the visible area:
+            self.control = TextWindow( tk.virtual_line_height,
+                                       tk.virtual_margin,
+                                       tk.virtual_text_height )
+            self.set_tooltip()
+        else:
+            super( ReadonlyEditor, self ).init( parent )
+
     #---------------------------------------------------------------------------
     #  Updates the editor when the object trait changes external to the editor:
     #---------------------------------------------------------------------------
@@ -248,8 +424,47 @@ class ReadonlyEditor ( BaseReadonlyEditor ):
         if self.factory.password:
             new_value = '*' * len( new_value )
 
-        if self.control.getText() != new_value:
-            self.control.setText( new_value )
+        self.set_text( new_value )
+
+#-------------------------------------------------------------------------------
+#  'DelayedTextEditor' class:
+#-------------------------------------------------------------------------------
+
+class DelayedTextEditor ( ToolkitEditorFactory ):
+    """ Editor factory for 'auto_set' text editors whose value is assigned
+        once typing pauses, with delays of their own rather than those of
+        the toolkit.
+    """
+
+    #---------------------------------------------------------------------------
+    #  Trait definitions:
+    #---------------------------------------------------------------------------
+
+    # Delay (in milliseconds) after the last keystroke before the value typed
+    # is assigned (None for the toolkit's 'text_auto_set_delay'):
+    auto_set_delay = Either( None, Int )
+
+    # Longest time (in milliseconds) the value typed is held back while typing
+    # continues (None for the toolkit's 'text_auto_set_max_wait'):
+    auto_set_max_wait = Either( None, Int )
+
+#-------------------------------------------------------------------------------
+#  'StreamingTextEditor' class:
+#-------------------------------------------------------------------------------
+
+class StreamingTextEditor ( ToolkitEditorFactory ):
+    """ Editor factory for text which grows by having text appended to it
+        (such as a log), whose multi-line read-only style only adds the new
+        text and shows at most a number of the last lines.
+    """
+
+    #---------------------------------------------------------------------------
+    #  Trait definitions:
+    #---------------------------------------------------------------------------
+
+    # Maximum number of (most recent) lines shown, 0 for no limit (None for
+    # the toolkit's 'text_stream_max_lines'):
+    max_lines = Either( None, Int )
 
 
 TextEditor = SimpleEditor
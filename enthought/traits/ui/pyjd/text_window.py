@@ -0,0 +1,319 @@
+#------------------------------------------------------------------------------
+#  Copyright (c) 2009, Richard Lincoln
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to
+#  deal in the Software without restriction, including without limitation the
+#  rights to use, copy, modify, merge, publish, distribute, sublicense, and/or
+#  sell copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in
+#  all copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+#  FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+#  IN THE SOFTWARE.
+#------------------------------------------------------------------------------
+
+""" Defines read-only, multi-line text views for large texts: one which only
+    renders the lines of its text that are in or near its visible area, and
+    one which only adds the new lines of text that grows by being appended to.
+"""
+
+#------------------------------------------------------------------------------
+#  Imports:
+#------------------------------------------------------------------------------
+
+from collections import deque
+
+from pyjamas import DOM
+
+from pyjamas.ui.HTML import HTML
+from pyjamas.ui.Composite import Composite
+from pyjamas.ui.ScrollPanel import ScrollPanel
+from pyjamas.ui.SimplePanel import SimplePanel
+from pyjamas.ui.VerticalPanel import VerticalPanel
+from pyjamas.ui.Label import Label
+
+#------------------------------------------------------------------------------
+#  "LineIndex" class:
+#------------------------------------------------------------------------------
+
+class LineIndex ( object ):
+    """ An index of the offsets at which the lines of a text start. The index
+        is only built as far as the lines that have been asked for, and is
+        kept when the text grows by having more text appended to it.
+    """
+
+    def __init__ ( self ):
+        """ Initialise the object.
+        """
+        self.text = ''
+
+        # The number of lines in the text:
+        self.count = 1
+
+        # The offsets of the start of the lines indexed so far:
+        self.offsets = [ 0 ]
+
+    def set_text ( self, text ):
+        """ Sets the text being indexed.
+        """
+        old = self.text
+        if (len( text ) >= len( old )) and text.startswith( old ):
+            # Appending to the text leaves the indexed lines unchanged:
+            self.count += text.count( '\n', len( old ) )
+        else:
+            self.count   = text.count( '\n' ) + 1
+            self.offsets = [ 0 ]
+
+        self.text = text
+
+    def offset ( self, line ):
+        """ Returns the offset of the start of a line (or the length of the
+            text if there is no such line).
+        """
+        offsets = self.offsets
+        if line < len( offsets ):
+            return offsets[ line ]
+
+        text = self.text
+        while len( offsets ) <= line:
+            end = text.find( '\n', offsets[-1] )
+            if end < 0:
+                return len( text )
+
+            offsets.append( end + 1 )
+
+        return offsets[ line ]
+
+    def lines ( self, first, last ):
+        """ Returns the text of the lines from first up to (but not including)
+            last.
+        """
+        start = self.offset( first )
+        if last >= self.count:
+            return self.text[ start: ]
+
+        # Exclude the line break ending the last line:
+        return self.text[ start: self.offset( last ) - 1 ]
+
+#------------------------------------------------------------------------------
+#  "TextWindow" class:
+#------------------------------------------------------------------------------
+
+class TextWindow ( Composite ):
+    """ A read-only, multi-line text view which only renders the lines in or
+        near its visible area, so that the cost of updating and scrolling it
+        does not depend on the size of its text.
+    """
+
+    def __init__ ( self, line_height, margin, height, **kwargs ):
+        """ Initialise the object.
+        """
+        Composite.__init__( self )
+
+        # The height (in pixels) of each line:
+        self.line_height = line_height
+
+        # The number of lines rendered above and below the visible area:
+        self.margin = margin
+
+        self.index = LineIndex()
+        self.first = self.last = -1
+
+        # The rendered lines are shown between two spacers that stand in for
+        # the lines above and below them:
+        self.top    = SimplePanel()
+        self.label  = Label()
+        self.bottom = SimplePanel()
+
+        element = self.label.getElement()
+        DOM.setStyleAttribute( element, 'whiteSpace', 'pre' )
+        DOM.setStyleAttribute( element, 'lineHeight', '%dpx' % line_height )
+
+        panel = VerticalPanel( Width = '100%' )
+        panel.add( self.top )
+        panel.add( self.label )
+        panel.add( self.bottom )
+
+        # The view must have a fixed height, otherwise it grows to fit all of
+        # the lines and is never scrolled:
+        self.scroller = ScrollPanel( panel, Height = '%dpx' % height )
+        self.scroller.addScrollListener( self )
+
+        self.initWidget( self.scroller, **kwargs )
+
+    def onLoad ( self ):
+        """ Renders the visible lines once the view is shown, and its height
+            is known.
+        """
+        self.refresh()
+
+    def refresh ( self ):
+        """ Renders the visible lines again.
+        """
+        self.first = self.last = -1
+        self.onScroll( self.scroller, 0, self.scroller.getScrollPosition() )
+
+    def getText ( self ):
+        """ Returns the text of the view.
+        """
+        return self.index.text
+
+    def setText ( self, text ):
+        """ Sets the text of the view.
+        """
+        self.index.set_text( text )
+
+        # Render the visible lines again, since they may have changed:
+        self.refresh()
+
+    def setEnabled ( self, enabled ):
+        """ Ignores enabling the view, since it is always read-only.
+        """
+        pass
+
+    def onScroll ( self, sender, left, top ):
+        """ Renders the lines near the visible area.
+        """
+        height = self.line_height
+        n      = self.index.count
+
+        # Before the view is shown its height is not known:
+        visible = self.scroller.getOffsetHeight() // height
+        if visible <= 0:
+            visible = self.margin
+
+        first = top // height
+        last  = first + visible + 1
+
+        self.render( max( 0, min( n, first - self.margin ) ),
+                     max( 0, min( n, last + self.margin ) ) )
+
+    def render ( self, first, last ):
+        """ Renders the lines from first up to (but not including) last.
+        """
+        if (first, last) == (self.first, self.last):
+            return
+
+        self.first, self.last = first, last
+
+        height = self.line_height
+        self.top.setHeight( '%dpx' % (first * height) )
+        self.label.setText( self.index.lines( first, last ) )
+        self.bottom.setHeight( '%dpx' % ((self.index.count - last) * height) )
+
+#------------------------------------------------------------------------------
+#  "TextStream" class:
+#------------------------------------------------------------------------------
+
+class TextStream ( Composite ):
+    """ A read-only, multi-line text view for text which grows by having text
+        appended to it (such as a log), showing at most a number of its last
+        lines. When the text grows, only the new text is added to the view.
+    """
+
+    def __init__ ( self, max_lines, height, **kwargs ):
+        """ Initialise the object.
+        """
+        Composite.__init__( self )
+
+        # The maximum number of lines shown (0 for no limit):
+        self.max_lines = max_lines
+
+        self.text = ''
+
+        # The elements showing each line, oldest first:
+        self.lines = deque()
+
+        # The text of the last line, which may still be added to:
+        self.last_line = ''
+
+        self.html = HTML()
+        self.element = self.html.getElement()
+        DOM.setStyleAttribute( self.element, 'whiteSpace', 'pre' )
+
+        # The view must have a fixed height, otherwise it grows to fit all of
+        # the lines and is never scrolled:
+        self.scroller = ScrollPanel( self.html, Height = '%dpx' % height )
+
+        self.initWidget( self.scroller, **kwargs )
+
+        self._add_line()
+
+    def getText ( self ):
+        """ Returns the text of the view.
+        """
+        return self.text
+
+    def setText ( self, text ):
+        """ Sets the text of the view, only adding the new text if the text
+            has grown by being appended to.
+        """
+        old = self.text
+        if (len( text ) >= len( old )) and text.startswith( old ):
+            tail = text[ len( old ): ]
+        else:
+            self._clear()
+            tail = text
+
+        self.text = text
+        if tail == '':
+            return
+
+        # Only split off the lines which can be shown:
+        max_lines = self.max_lines
+        if max_lines > 0:
+            lines = tail.rsplit( '\n', max_lines )
+            if len( lines ) > max_lines:
+                # All of the lines shown are replaced by the new ones:
+                self._clear()
+                del lines[0]
+        else:
+            lines = tail.split( '\n' )
+
+        # The first new line continues the last line shown:
+        self.last_line += lines[0]
+        DOM.setInnerText( self.lines[-1], self.last_line )
+
+        for line in lines[1:]:
+            self.last_line = line
+            self._add_line()
+
+        # Evict the oldest lines that are over the limit:
+        if self.max_lines > 0:
+            while len( self.lines ) > self.max_lines:
+                DOM.removeChild( self.element, self.lines.popleft() )
+
+        # Follow the end of the text:
+        self.scroller.scrollToBottom()
+
+    def setEnabled ( self, enabled ):
+        """ Ignores enabling the view, since it is always read-only.
+        """
+        pass
+
+    def _add_line ( self ):
+        """ Adds an element showing the last line.
+        """
+        line = DOM.createDiv()
+        DOM.setInnerText( line, self.last_line )
+        DOM.appendChild( self.element, line )
+        self.lines.append( line )
+
+    def _clear ( self ):
+        """ Removes all lines.
+        """
+        while len( self.lines ) > 0:
+            DOM.removeChild( self.element, self.lines.popleft() )
+
+        self.last_line = ''
+        self._add_line()
+
+# EOF -------------------------------------------------------------------------
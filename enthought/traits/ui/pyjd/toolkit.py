@@ -35,10 +35,14 @@ from pyjamas.ui.RootPanel import RootPanel
 
 pyjd.setup("TraitsBackendPyjamas.html")
 
+from enthought.traits.api import Bool, Int, Instance
+
 from enthought.traits.ui.toolkit import Toolkit
 
 from enthought.traits.ui.editor_factory import EditorFactory
 
+from build_profiler import BuildProfiler
+
 #------------------------------------------------------------------------------
 #  Constants:
 #------------------------------------------------------------------------------
@@ -54,6 +58,82 @@ class GUIToolkit(Toolkit):
     """ Implementation class for Pyjamas toolkit.
     """
 
+    #--------------------------------------------------------------------------
+    #  Trait definitions:
+    #--------------------------------------------------------------------------
+
+    # Push the changes to the object trait of an editor to its control once
+    # per event loop tick, rather than as soon as each change is made?
+    coalesce_updates = Bool( False )
+
+    # Build the pages of a tabbed panel only when they are first selected?
+    lazy_tabs = Bool( False )
+
+    # Delay (in milliseconds) between building each unselected page of a lazy
+    # tabbed panel in the background (-1 to only build pages when selected):
+    tab_prefetch_delay = Int( -1 )
+
+    # Minimum number of items in a group of a scrollable UI for only the rows
+    # near the visible area to be rendered (0 to always render every row):
+    virtual_group_size = Int( 0 )
+
+    # Estimated height (in pixels) of each row of a virtual group:
+    virtual_row_height = Int( 24 )
+
+    # Number of rows rendered above and below the visible area of a virtual
+    # group:
+    virtual_margin = Int( 20 )
+
+    # Height (in pixels) of the scroll panel of a UI with a virtual group, if
+    # the View does not specify one:
+    virtual_viewport_height = Int( 400 )
+
+    # Show the text of multi-line read-only text editors through a window of
+    # the visible lines (so that large texts are cheap to show and update)?
+    virtual_text = Bool( False )
+
+    # Height (in pixels) of each line of a multi-line read-only text editor
+    # showing a window of its lines:
+    virtual_line_height = Int( 16 )
+
+    # Height (in pixels) of a multi-line read-only text editor showing a
+    # window of its lines, if its Item does not specify one:
+    virtual_text_height = Int( 300 )
+
+    # Show the text of multi-line read-only text editors as a stream, only
+    # adding the text appended to it rather than replacing it all?
+    text_streaming = Bool( False )
+
+    # Maximum number of (most recent) lines shown by a streaming read-only
+    # text editor (0 for no limit):
+    text_stream_max_lines = Int( 1000 )
+
+    # Height (in pixels) of a streaming read-only text editor, if its Item
+    # does not specify one:
+    text_stream_height = Int( 300 )
+
+    # Delay (in milliseconds) after the last keystroke before the value typed
+    # into an 'auto_set' text editor is assigned (0 to only assign it when the
+    # text is committed):
+    text_auto_set_delay = Int( 0 )
+
+    # Longest time (in milliseconds) a value typed into an 'auto_set' text
+    # editor is held back while typing continues (-1 for no limit):
+    text_auto_set_max_wait = Int( -1 )
+
+    # Number of children of a tree editor node shown at once, with a node for
+    # showing the next page of them (0 to always show all of the children):
+    tree_page_size = Int( 0 )
+
+    # Time (in milliseconds) a tree editor spends expanding nodes to its
+    # 'auto_open' level in each event loop tick, so that it is shown while the
+    # nodes are expanded (0 to expand all of them before it is shown):
+    tree_expand_budget = Int( 0 )
+
+    # Profiler recording the time taken to build each group, list of items
+    # and editor of a panel (None if panel building is not profiled):
+    profiler = Instance( BuildProfiler )
+
     def ui_live(self, ui, parent):
         """ Creates a non-modal "live update" user interface using information
             from the specified UI object.
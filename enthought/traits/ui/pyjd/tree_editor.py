@@ -29,6 +29,13 @@
 #-------------------------------------------------------------------------------
 
 import copy
+import time
+
+from itertools import islice
+
+from collections import deque
+
+from pyjamas.Timer import Timer
 
 from pyjamas.ui.Tree import Tree
 from pyjamas.ui.VerticalPanel import VerticalPanel
@@ -40,7 +47,7 @@ from enthought.pyface.resource_manager \
     import resource_manager
 
 from enthought.traits.api \
-    import Any, Event
+    import Any, Event, Either, Int
 
 from enthought.traits.trait_base \
     import enumerate
@@ -48,6 +55,9 @@ from enthought.traits.trait_base \
 from enthought.traits.ui.api \
     import TreeNode, ObjectTreeNode, MultiTreeNode
 
+from enthought.traits.ui.toolkit \
+    import toolkit
+
 # FIXME: ToolkitEditorFactory is a proxy class defined here just for backward
 # compatibility. The class has been moved to the
 # enthought.traits.ui.editors.tree_editor file.
@@ -90,6 +100,69 @@ RenameAction = Action( name         = 'Rename',
                        action       = 'editor._menu_rename_node',
                        enabled_when = 'editor._is_renameable(object)' )
 
+#-------------------------------------------------------------------------------
+#  Returns whether a TreeNode only depends upon the class of an object:
+#-------------------------------------------------------------------------------
+
+def is_class_node ( node ):
+    """ Returns whether a TreeNode decides whether it is the node for an object
+        using only the class of the object (i.e. it does not override the
+        standard TreeNode 'is_node_for' method).
+    """
+    method = getattr( type( node ).is_node_for, 'im_func', None )
+
+    return (method is TreeNode.is_node_for.im_func)
+
+#-------------------------------------------------------------------------------
+#  '_NodeIds' class:
+#-------------------------------------------------------------------------------
+
+class _NodeIds ( object ):
+    """ A mapping of node ids to values which keeps the node ids in the order
+        they were added (like the OrderedDict of newer Pythons).
+    """
+
+    def __init__ ( self ):
+        """ Initialise the object.
+        """
+        self._values = {}
+        self._order  = []
+
+    def __setitem__ ( self, nid, value ):
+        if nid not in self._values:
+            self._order.append( nid )
+        self._values[ nid ] = value
+
+    def __delitem__ ( self, nid ):
+        self.pop( nid )
+
+    def __contains__ ( self, nid ):
+        return (nid in self._values)
+
+    def __len__ ( self ):
+        return len( self._order )
+
+    def __iter__ ( self ):
+        return iter( self._order )
+
+    def first ( self ):
+        """ Returns the node id added first.
+        """
+        return self._order[0]
+
+    def pop ( self, nid ):
+        """ Removes a node id and returns its value.
+        """
+        value = self._values.pop( nid )
+        self._order.remove( nid )
+
+        return value
+
+    def values ( self ):
+        """ Returns the values of the node ids, in order.
+        """
+        return [ self._values[ nid ] for nid in self._order ]
+
 #-------------------------------------------------------------------------------
 #  'SimpleEditor' class:
 #-------------------------------------------------------------------------------
@@ -204,8 +277,30 @@ class SimpleEditor ( Editor ):
             # Otherwise, just create the tree control:
             self.control = self._tree = Tree()
 
-        # Set up the mapping between objects and tree id's:
-        self._map = {}
+        # Set up the mappings between objects and tree id's. The nodes of each
+        # object are indexed both by object and by (object, children name):
+        self._map   = {}
+        self._names = {}
+
+        # The number of children of a node shown at once (0 for all of them),
+        # from a LargeTreeEditor factory or else the toolkit:
+        page_size = getattr( factory, 'page_size', None )
+        if page_size is None:
+            page_size = toolkit().tree_page_size
+        self._page_size = page_size
+
+        # The time (in milliseconds) spent expanding nodes to the 'auto_open'
+        # level in each event loop tick (0 to expand them all at once), from a
+        # LargeTreeEditor factory or else the toolkit:
+        budget = getattr( factory, 'expand_budget', None )
+        if budget is None:
+            budget = toolkit().tree_expand_budget
+        self._expand_budget = budget
+
+        # The pending ( nid, levels, expand ) node expansions, and the timer
+        # performing them:
+        self._expanding = deque()
+        self._expand_timer = None
 
         # Initialize the 'undo state' stack:
         self._undoable = []
@@ -255,6 +350,8 @@ class SimpleEditor ( Editor ):
         """ Disposes of the contents of an editor.
         """
         if self._tree is not None:
+            self._cancel_expand()
+
             # Stop the chatter (specifically about the changing selection).
 #            self._tree.blockSignals(True)
 
@@ -270,7 +367,19 @@ class SimpleEditor ( Editor ):
 
     def expand_levels ( self, nid, levels, expand = True ):
         """ Expands from the specified node the specified number of sub-levels.
+
+            If the editor has an expansion budget, the nodes are expanded
+            breadth first (so that the top levels are shown first) by a job
+            which only runs for the length of the budget in each event loop
+            tick.
         """
+        if self._expand_budget > 0:
+            self._expanding.append( ( nid, levels, expand ) )
+            if self._expand_timer is None:
+                self._expand_timer = Timer( notify = self._on_expand_timer )
+                self._expand_timer.schedule( 0 )
+            return
+
         if levels > 0:
             expanded, node, object = self._get_node_data( nid )
             if self._has_children( node, object ):
@@ -280,6 +389,48 @@ class SimpleEditor ( Editor ):
                 for cnid in self._nodes_for( nid ):
                     self.expand_levels( cnid, levels - 1 )
 
+    #---------------------------------------------------------------------------
+    #  Performs the pending node expansions for one event loop tick:
+    #---------------------------------------------------------------------------
+
+    def _on_expand_timer ( self, timer ):
+        """ Performs the pending node expansions until the expansion budget
+            for this event loop tick has been used up.
+        """
+        expanding = self._expanding
+        end = time.time() + (self._expand_budget / 1000.0)
+        while (len( expanding ) > 0) and (time.time() < end):
+            nid, levels, expand = expanding.popleft()
+
+            # Skip any node which has been deleted since it was queued:
+            if (levels <= 0) or (not self._is_mapped( nid )):
+                continue
+
+            expanded, node, object = self._get_node_data( nid )
+            if self._has_children( node, object ):
+                self._expand_node( nid )
+                if expand:
+                    nid.setState( True )
+                for cnid in self._nodes_for( nid ):
+                    expanding.append( ( cnid, levels - 1, True ) )
+
+        if len( expanding ) > 0:
+            timer.schedule( 0 )
+        else:
+            self._expand_timer = None
+
+    #---------------------------------------------------------------------------
+    #  Cancels any pending node expansions:
+    #---------------------------------------------------------------------------
+
+    def _cancel_expand ( self ):
+        """ Cancels any pending node expansions.
+        """
+        self._expanding.clear()
+        if self._expand_timer is not None:
+            self._expand_timer.cancel()
+            self._expand_timer = None
+
     #---------------------------------------------------------------------------
     #  Updates the editor when the object trait changes external to the editor:
     #---------------------------------------------------------------------------
@@ -291,6 +442,9 @@ class SimpleEditor ( Editor ):
         tree = self._tree
 #        saved_state = {}
 
+        # Stop expanding the nodes of the previous value:
+        self._cancel_expand()
+
         tree.clear()
 
         object, node = self._node_for( self.value )
@@ -303,7 +457,10 @@ class SimpleEditor ( Editor ):
 #                nid.setIcon(0, self._get_icon(node, object))
 #                nid.setToolTip(0, node.get_tooltip(object))
 
-            self._map[ id( object ) ] = [ ( node.children, nid ) ]
+            # The root object's nodes are replaced by the new root node:
+            for name in self._map.pop( id( object ), {} ).values():
+                self._names.pop( ( id( object ), name ), None )
+            self._map_node( nid, node, object )
             self._add_listeners( node, object )
             self._set_node_data( nid, ( False, node, object) )
             if self.factory.hide_root or self._has_children( node, object ):
@@ -328,18 +485,22 @@ class SimpleEditor ( Editor ):
     #  Appends a new node to the specified node:
     #---------------------------------------------------------------------------
 
-    def _append_node ( self, nid, node, object ):
-        """ Appends a new node to the specified node.
+    def _append_node ( self, nid, node, object, index = None ):
+        """ Appends a new node to the specified node (or inserts it at the
+            specified position within its children).
         """
         cnid = TreeItem( node.get_label(object) )
+        if index is None:
+            nid.addItem( cnid )
+        else:
+            nid.insertItem( cnid, index )
 #        cnid.setText(0, node.get_label(object))
 #        cnid.setIcon(0, self._get_icon(node, object))
 #        cnid.setToolTip(0, node.get_tooltip(object))
 
         has_children = self._has_children(node, object)
         self._set_node_data( cnid, ( False, node, object ) )
-        self._map.setdefault( id( object ), [] ).append(
-            ( node.children, cnid ) )
+        self._map_node( cnid, node, object )
         self._add_listeners( node, object )
 
         # Automatically expand the new node (if requested):
@@ -377,16 +538,8 @@ class SimpleEditor ( Editor ):
             return
 
         expanded, node, object = self._get_node_data( nid )
-        id_object = id( object )
-        object_info = self._map[id_object]
-        for i, info in enumerate( object_info ):
-            if nid == info[1]:
-                del object_info[i]
-                break
-
-        if len( object_info ) == 0:
+        if self._unmap_node( nid, node, object ):
             self._remove_listeners( node, object )
-            del self._map[ id_object ]
 
         if pnid is None:
 #            self._tree.takeTopLevelItem(self._tree.indexOfTopLevelItem(nid))
@@ -416,14 +569,86 @@ class SimpleEditor ( Editor ):
                 nid.removeItem( dummy )
                 del nid._dummy
 
-            for child in node.get_children( object ):
-                child, child_node = self._node_for( child )
-                if child_node is not None:
-                    self._append_node( nid, child_node, child )
+            # Show the first page of children:
+            nid._shown  = 0
+            nid._sparse = False
+            self._append_page( nid )
 
             # Indicate the item is now populated:
             self._set_node_data( nid, ( True, node, object) )
 
+    #---------------------------------------------------------------------------
+    #  Appends the next page of children to a specified node:
+    #---------------------------------------------------------------------------
+
+    def _append_page ( self, nid ):
+        """ Appends the next page of children of a specified node, followed by
+            a 'more' node if there are still children left to show.
+        """
+        expanded, node, object = self._get_node_data( nid )
+        children = node.get_children( object )
+
+        more = getattr( nid, '_more', None )
+        if more is not None:
+            nid.removeItem( more )
+            del nid._more
+
+        first = nid._shown
+        last  = len( children )
+        if self._page_size > 0:
+            last = min( last, first + self._page_size )
+
+        for child in children[ first: last ]:
+            child, child_node = self._node_for( child )
+            if child_node is not None:
+                self._append_node( nid, child_node, child )
+            else:
+                # Not every child shown has a tree item:
+                nid._sparse = True
+
+        nid._shown = last
+        self._update_more( nid, len( children ) )
+
+    #---------------------------------------------------------------------------
+    #  Updates the 'more' node of a specified node:
+    #---------------------------------------------------------------------------
+
+    def _update_more ( self, nid, count ):
+        """ Updates the 'more' node of a specified node, given the number of
+            children it has, adding or removing it as needed.
+        """
+        more = getattr( nid, '_more', None )
+        left = count - nid._shown
+        if left <= 0:
+            if more is not None:
+                nid.removeItem( more )
+                del nid._more
+            return
+
+        label = 'Show %d more...' % left
+        if more is None:
+            # Like the dummy node, the 'more' node has no node data:
+            more = nid._more = TreeItem( label )
+            more._more_for = nid
+            nid.addItem( more )
+        else:
+            more.setText( label )
+
+    #---------------------------------------------------------------------------
+    #  Returns the number of tree items shown for a list of children:
+    #---------------------------------------------------------------------------
+
+    def _count_nodes ( self, children ):
+        """ Returns the number of a list of children which have a node, and so
+            are shown as a tree item.
+        """
+        count = 0
+        for child in children:
+            if self._node_for( child )[1] is not None:
+                count += 1
+
+        return count
+
     #---------------------------------------------------------------------------
     #  Returns each of the child nodes of a specified node id:
     #---------------------------------------------------------------------------
@@ -431,7 +656,13 @@ class SimpleEditor ( Editor ):
     def _nodes_for ( self, nid ):
         """ Returns all child node ids of a specified node id.
         """
-        return [nid.child(i) for i in range( nid.childCount() )]
+        n = nid.childCount()
+
+        # The 'more' node (if any) is always the last child:
+        if getattr( nid, '_more', None ) is not None:
+            n -= 1
+
+        return [nid.child(i) for i in range( n )]
 
     #---------------------------------------------------------------------------
     #  Return the index of a specified node id within its parent:
@@ -442,10 +673,17 @@ class SimpleEditor ( Editor ):
         if pnid is None:
             return ( None, None, None )
 
-        for i in range( pnid.childCount() ):
-            if pnid.child(i) is nid:
-                _, pnode, pobject = self._get_node_data( pnid )
-                return ( pnode, pobject, i )
+        # The position recorded for the node is only out of date if nodes have
+        # been inserted or removed before it since, in which case the positions
+        # of all of its siblings are recorded again:
+        i = getattr( nid, '_index', -1 )
+        if (i < 0) or (i >= pnid.childCount()) or (pnid.child( i ) is not nid):
+            for j, cnid in enumerate( self._nodes_for( pnid ) ):
+                cnid._index = j
+            i = nid._index
+
+        _, pnode, pobject = self._get_node_data( pnid )
+        return ( pnode, pobject, i )
 
     #---------------------------------------------------------------------------
     #  Returns whether a specified object has any children:
@@ -530,12 +768,10 @@ class SimpleEditor ( Editor ):
         """ Returns the tree node data for a specified object in the form
             ( expanded, node, nid ).
         """
-        info = self._map[ id( object ) ]
-        for name2, nid in info:
-            if name == name2:
-                break
-        else:
-            nid = info[0][1]
+        nids = self._names.get( ( id( object ), name ) )
+        if not nids:
+            nids = self._map[ id( object ) ]
+        nid = nids.first()
 
         expanded, node, ignore = self._get_node_data( nid )
 
@@ -546,13 +782,61 @@ class SimpleEditor ( Editor ):
             form: [ ( expanded, node, nid ), ... ].
         """
         result = []
-        for name2, nid in self._map[ id( object ) ]:
-            if name == name2:
-                expanded, node, ignore = self._get_node_data( nid )
-                result.append( ( expanded, node, nid ) )
+        for nid in self._names.get( ( id( object ), name ), () ):
+            expanded, node, ignore = self._get_node_data( nid )
+            result.append( ( expanded, node, nid ) )
 
         return result
 
+    #---------------------------------------------------------------------------
+    #  Adds/Removes a node id to/from the object mappings:
+    #---------------------------------------------------------------------------
+
+    def _map_node ( self, nid, node, object ):
+        """ Adds a node id for an object to the object mappings.
+        """
+        id_object = id( object )
+        nids = self._map.get( id_object )
+        if nids is None:
+            nids = self._map[ id_object ] = _NodeIds()
+        nids[ nid ] = node.children
+
+        key   = ( id_object, node.children )
+        names = self._names.get( key )
+        if names is None:
+            names = self._names[ key ] = _NodeIds()
+        names[ nid ] = None
+
+    def _is_mapped ( self, nid ):
+        """ Returns whether a node id is in the object mappings (i.e. has not
+            been deleted).
+        """
+        data = getattr( nid, '_py_data', None )
+        if data is None:
+            return False
+
+        return (nid in self._map.get( id( data[2] ), () ))
+
+    def _unmap_node ( self, nid, node, object ):
+        """ Removes a node id for an object from the object mappings, and
+            returns whether the object has no node ids left.
+        """
+        id_object = id( object )
+        nids = self._map[ id_object ]
+        name = nids.pop( nid )
+
+        key   = ( id_object, name )
+        names = self._names[ key ]
+        del names[ nid ]
+        if len( names ) == 0:
+            del self._names[ key ]
+
+        if len( nids ) == 0:
+            del self._map[ id_object ]
+            return True
+
+        return False
+
     #---------------------------------------------------------------------------
     #  Returns the TreeNode associated with a specified object:
     #---------------------------------------------------------------------------
@@ -564,18 +848,72 @@ class SimpleEditor ( Editor ):
             isinstance( object[1], TreeNode )):
             return object
 
-        # Select all nodes which understand this object:
+        # The nodes which only depend upon the class of an object are resolved
+        # once for each class:
+        nodes, dynamic, resolved = self._node_cache()
+        klass = object.__class__
+        entry = resolved.get( klass )
+        if entry is None:
+            matched = [ ( i, node ) for i, node in nodes
+                        if node.is_node_for( object ) ]
+            result  = None
+            if len( dynamic ) == 0:
+                result = self._select_node( [ node for i, node in matched ] )
+            entry = resolved[ klass ] = ( matched, result )
+
+        matched, result = entry
+        if len( dynamic ) == 0:
+            return ( object, result )
+
+        # Otherwise, add the nodes whose test depends upon the object itself
+        # (keeping all nodes in the order they were defined in):
+        matched = matched + [ ( i, node ) for i, node in dynamic
+                              if node.is_node_for( object ) ]
+        matched.sort()
+
+        return ( object, self._select_node( [ node for i, node in matched ] ) )
+
+    #---------------------------------------------------------------------------
+    #  Returns the node resolution cache of the editor factory:
+    #---------------------------------------------------------------------------
+
+    def _node_cache ( self ):
+        """ Returns the node resolution cache of the editor factory as a tuple
+            of the form: ( class_nodes, dynamic_nodes, resolved ), where the
+            node lists contain ( index, node ) pairs and resolved maps each
+            class to its ( matched_class_nodes, node ) pair.
+        """
         factory = self.factory
-        nodes   = [ node for node in factory.nodes
-                    if node.is_node_for( object ) ]
+        key     = tuple( factory.nodes )
+        cache   = getattr( factory, '_node_cache', None )
+        if (cache is None) or (cache[0] != key):
+            nodes   = []
+            dynamic = []
+            for i, node in enumerate( key ):
+                if is_class_node( node ):
+                    nodes.append( ( i, node ) )
+                else:
+                    dynamic.append( ( i, node ) )
+
+            cache = factory._node_cache = ( key, nodes, dynamic, {} )
 
+        return cache[1:]
+
+    #---------------------------------------------------------------------------
+    #  Selects the TreeNode to use from all of the nodes for an object:
+    #---------------------------------------------------------------------------
+
+    def _select_node ( self, nodes ):
+        """ Selects the TreeNode to use from all of the nodes which understand
+            an object (or returns None if there are none).
+        """
         # If only one found, we're done, return it:
         if len( nodes ) == 1:
-            return ( object, nodes[0] )
+            return nodes[0]
 
         # If none found, give up:
         if len( nodes ) == 0:
-            return ( object, None )
+            return None
 
         # Use all selected nodes that have the same 'node_for' list as the
         # first selected node:
@@ -584,7 +922,7 @@ class SimpleEditor ( Editor ):
 
         # If only one left, then return that node:
         if len( nodes ) == 1:
-            return ( object, nodes[0] )
+            return nodes[0]
 
         # Otherwise, return a MultiTreeNode based on all selected nodes...
 
@@ -600,16 +938,17 @@ class SimpleEditor ( Editor ):
             root_node = nodes[0]
 
         # If we have a matching MultiTreeNode already cached, return it:
-        key = ( root_node, ) + tuple( nodes )
+        factory = self.factory
+        key     = ( root_node, ) + tuple( nodes )
         if key in factory.multi_nodes:
-            return ( object, factory.multi_nodes[ key ] )
+            return factory.multi_nodes[ key ]
 
         # Otherwise create one, cache it, and return it:
         factory.multi_nodes[ key ] = multi_node = MultiTreeNode(
                                                        root_node = root_node,
                                                        nodes     = nodes )
 
-        return ( object, multi_node )
+        return multi_node
 
     #---------------------------------------------------------------------------
     #  Returns the TreeNode associated with a specified class:
@@ -728,14 +1067,13 @@ class SimpleEditor ( Editor ):
     def _get_object_nid ( self, object, name = '' ):
         """ Gets the ID associated with a specified object (if any).
         """
-        info = self._map.get( id( object ) )
-        if info is None:
-            return None
-        for name2, nid in info:
-            if name == name2:
-                return nid
-        else:
-            return info[0][1]
+        nids = self._names.get( ( id( object ), name ) )
+        if not nids:
+            nids = self._map.get( id( object ) )
+            if nids is None:
+                return None
+
+        return nids.first()
 
     #---------------------------------------------------------------------------
     #  Clears the current editor pane (if any):
@@ -846,6 +1184,12 @@ class SimpleEditor ( Editor ):
     def _on_item_clicked(self, nid, col):
         """ Handles a tree item being clicked.
         """
+        # Clicking a 'more' node shows the next page of its parent's children:
+        pnid = getattr(nid, '_more_for', None)
+        if pnid is not None:
+            self._append_page(pnid)
+            return
+
         _, node, object = self._get_node_data(nid)
 
         if node.click(object) is True and self.factory.on_click is not None:
@@ -883,6 +1227,12 @@ class SimpleEditor ( Editor ):
         # Get the new selection:
         nids = [ self._tree.getSelectedItem() ]
 
+        # Selecting a 'more' node shows the next page of its parent's children:
+        pnid = getattr(nids[0], '_more_for', None)
+        if pnid is not None:
+            self._append_page(pnid)
+            return
+
         selected = []
         if len(nids) > 0:
             for n in nids:
@@ -1367,11 +1717,10 @@ class SimpleEditor ( Editor ):
                 for cnid in self._nodes_for( nid ):
                     self._delete_node( cnid )
 
-                # Add all of the children back in as new nodes:
-                for child in children:
-                    child, child_node = self._node_for( child )
-                    if child_node is not None:
-                        self._append_node( nid, child_node, child )
+                # Add the first page of children back in as new nodes:
+                nid._shown  = 0
+                nid._sparse = False
+                self._append_page( nid )
 
             # Try to expand the node (if requested):
             if node.can_auto_open( object ):
@@ -1393,27 +1742,52 @@ class SimpleEditor ( Editor ):
         start = event.index
         n     = len( event.added )
         end   = start + len( event.removed )
-        tree                = self._tree
 
         for expanded, node, nid in self._object_info_for( object, name ):
-            children = node.get_children( object )
-
-            # If the new children aren't all at the end, remove/add them all:
-            if (n > 0) and ((start + n) != len( children )):
-                self._children_replaced( object, name, event )
-                return
-
             # Only add/remove the changes if the node has already been expanded:
             if expanded:
-                # Remove all of the children that were deleted:
-                for cnid in self._nodes_for( nid )[ start: end ]:
-                    self._delete_node( cnid )
-
-                # Add all of the children that were added:
-                for child in event.added:
-                    child, child_node = self._node_for( child )
-                    if child_node is not None:
-                        self._append_node( nid, child_node, child )
+                children = node.get_children( object )
+
+                # Remove the nodes of the children that were deleted (and are
+                # being shown). Children without a node have no tree item, so
+                # if there are any the position of the items differs from that
+                # of the children:
+                shown = nid._shown
+                if start < shown:
+                    last = min( end, shown )
+                    if nid._sparse:
+                        first = self._count_nodes( islice( children, start ) )
+                        count = self._count_nodes(
+                                    islice( event.removed, last - start ) )
+                    else:
+                        first = start
+                        count = last - start
+                    cnids = [ nid.child( i )
+                              for i in range( first, first + count ) ]
+                    for cnid in cnids:
+                        self._delete_node( cnid )
+                    nid._shown = shown = shown - (last - start)
+
+                if start < shown:
+                    # Insert nodes for the children that were added amongst the
+                    # children being shown:
+                    index = first
+                    for child in event.added:
+                        child, child_node = self._node_for( child )
+                        if child_node is not None:
+                            self._append_node( nid, child_node, child, index )
+                            index += 1
+                        else:
+                            nid._sparse = True
+                    nid._shown += n
+                    self._update_more( nid, len( children ) )
+                elif getattr( nid, '_more', None ) is None:
+                    # Append the children that were added after all of the
+                    # children being shown:
+                    self._append_page( nid )
+                else:
+                    # The children that were added are beyond those shown:
+                    self._update_more( nid, len( children ) )
 
             # Try to expand the node (if requested):
             if node.can_auto_open( object ):
@@ -1429,13 +1803,10 @@ class SimpleEditor ( Editor ):
         # Prevent the itemChanged() signal from being emitted.
 #        blk = self._tree.blockSignals(True)
 
-        nids = {}
-        for name2, nid in self._map[ id( object ) ]:
-            if nid not in nids:
-                nids[ nid ] = None
-                node = self._get_node_data( nid )[1]
-                nid.setText( node.get_label( object ) )
-                self._update_icon( nid )
+        for nid in self._map[ id( object ) ]:
+            node = self._get_node_data( nid )[1]
+            nid.setText( node.get_label( object ) )
+            self._update_icon( nid )
 
 #        self._tree.blockSignals(blk)
 
@@ -1471,3 +1842,29 @@ class SimpleEditor ( Editor ):
 #        return None
 
 #-- End UI preference save/restore interface -----------------------------------
+
+#-------------------------------------------------------------------------------
+#  'LargeTreeEditor' class:
+#-------------------------------------------------------------------------------
+
+class LargeTreeEditor ( ToolkitEditorFactory ):
+    """ Editor factory for large trees, whose nodes may have very many
+        children (which are shown a page at a time) and whose nodes are
+        expanded to the 'auto_open' level a few at a time.
+    """
+
+    #---------------------------------------------------------------------------
+    #  Trait definitions:
+    #---------------------------------------------------------------------------
+
+    # Number of children of a node shown at once, with a node for showing the
+    # next page of them, 0 to always show all of the children (None for the
+    # toolkit's 'tree_page_size'):
+    page_size = Either( None, Int )
+
+    # Time (in milliseconds) spent expanding nodes to the 'auto_open' level in
+    # each event loop tick, 0 to expand all of them before the tree is shown
+    # (None for the toolkit's 'tree_expand_budget'):
+    expand_budget = Either( None, Int )
+
+# EOF -------------------------------------------------------------------------
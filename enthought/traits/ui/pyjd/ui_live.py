@@ -40,7 +40,7 @@ from pyjamas.ui import HasAlignment
 
 from ui_base import BaseDialog
 
-from ui_panel import panel
+from ui_panel import panel, retain_panel
 
 from enthought.traits.ui.undo import UndoHistory
 
@@ -103,6 +103,8 @@ class _LiveWindow(BaseDialog):
                 history.on_trait_change(self._on_revertable, 'undoable',
                         remove=True)
 
+            # Keep the unchanged parts of the panel for the rebuilt one:
+            retain_panel(ui)
             ui.reset()
         else:
             self.create_dialog(parent, style)
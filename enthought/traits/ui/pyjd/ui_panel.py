@@ -29,17 +29,20 @@
 #------------------------------------------------------------------------------
 #from Tooltip import TooltipListener
 
-import re
+import logging
 
 from enthought.traits.api import Undefined
-from enthought.traits.ui.api import Group
+from enthought.traits.ui.toolkit import toolkit
 #from enthought.pyface.api import HeadingText
 
+from pyjamas.Timer import Timer
+
 from pyjamas.ui.Widget import Widget
 from pyjamas.ui.VerticalPanel import VerticalPanel
 from pyjamas.ui.HorizontalPanel import HorizontalPanel
 from pyjamas.ui.TabPanel import TabPanel
 from pyjamas.ui.ScrollPanel import ScrollPanel
+from pyjamas.ui.SimplePanel import SimplePanel
 from pyjamas.ui.FlowPanel import FlowPanel
 from pyjamas.ui.Label import Label
 from pyjamas.ui.FlexTable import FlexTable
@@ -50,12 +53,16 @@ from pyjamas.ui.horizsplitpanel import HorizontalSplitPanel
 
 from editor import Editor
 
+from helper \
+    import evaluate_expression, compile_expression, expression_dependencies
+
+from layout_plan import plan_for, factory_cache
+
 #------------------------------------------------------------------------------
-#  Constants:
+#  Start logging:
 #------------------------------------------------------------------------------
 
-# Pattern of all digits
-all_digits = re.compile( r'\d+' )
+logger = logging.getLogger(__name__)
 
 #------------------------------------------------------------------------------
 #  Creates a panel-based user interface for a specified UI object:
@@ -67,72 +74,99 @@ def panel ( ui ):
     # Bind the context values to the 'info' object:
     ui.info.bind_context()
 
+    # Monitor the conditions of the editors created for the UI:
+    _Conditions.install(ui)
+
+    # Record the parts built for the UI, reusing any unchanged parts retained
+    # from the panel it replaces:
+    parts = _PanelParts.install(ui)
+
     # Get the content that will be displayed in the user interface:
-    content = ui._groups
-    nr_groups = len(content)
+    groups = ui._groups
+    nr_groups = len(groups)
+
+    # Get the compiled layout plan for each group:
+    content = [ (plan_for(group), group) for group in groups ]
+
+    # If the UI is scrollable then the panel is wrapped in a scroll area.
+    scroller = None
+    if ui.scrollable:
+        scroller = ScrollPanel()
 
     if nr_groups == 0:
         panel = None
     if nr_groups == 1:
-        panel = _GroupPanel(content[0], ui).control
+        panel = _GroupPanel(groups[0], ui, plan=content[0][0],
+                            scroller=scroller).control
     elif nr_groups > 1:
         panel = TabPanel()
-        _fill_panel(panel, content, ui)
+        _fill_panel(panel, content, ui, scroller=scroller)
         panel.ui = ui
 
-    # If the UI is scrollable then wrap the panel in a scroll area.
-    if ui.scrollable and panel is not None:
-        sp = ScrollPanel()
-        sp.add(panel)
-        panel = sp
+    if scroller is not None and panel is not None:
+        scroller.add(panel)
+        panel = scroller
+
+    # Dispose of any retained parts that were not reused:
+    parts.release()
 
     return panel
 
+#------------------------------------------------------------------------------
+#  Retains the parts of the panel of a UI for reuse by its replacement:
+#------------------------------------------------------------------------------
+
+def retain_panel ( ui ):
+    """ Retains the groups and editors of the panel of a UI which is about to
+        be reset or disposed of, so that the next panel built for the same
+        context can reuse the parts that are unchanged. Any retained parts
+        not reused by the next panel are disposed of once it has been built.
+    """
+    parts = getattr(ui, '_panel_parts', None)
+    if parts is not None:
+        parts.retain()
+
+#------------------------------------------------------------------------------
+#  Disposes of any retained panel parts that have not been reused:
+#------------------------------------------------------------------------------
+
+def release_panel ( ui ):
+    """ Disposes of any parts of the panel of a UI retained by 'retain_panel'
+        that are still pending (e.g. because no new panel was built).
+    """
+    parts = getattr(ui, '_panel_parts', None)
+    if parts is not None:
+        parts.release_pending()
+
 #-------------------------------------------------------------------------------
 #  Fill a page based container panel with content:
 #-------------------------------------------------------------------------------
 
-def _fill_panel(panel, content, ui, item_handler=None):
-    """ Fill a page based container panel with content.
+def _fill_panel(panel, content, ui, item_handler=None, scroller=None):
+    """ Fill a page based container panel with content, given as a list of
+        ( plan, Group or Item ) pairs.
     """
     active = 0
+    for index, (plan, item) in enumerate(content):
+        if plan.is_group and item.selected:
+            active = index
 
-    for index, item in enumerate(content):
+    # See if the pages other than the active one should be built lazily:
+    lazy = isinstance(panel, TabPanel) and toolkit().lazy_tabs
+    pages = {}
+
+    for index, (plan, item) in enumerate(content):
         page_name = item.get_label(ui)
         if page_name == "":
             page_name = "Page %d" % index
 
-        if isinstance(item, Group):
-            if item.selected:
-                active = index
-
-            gp = _GroupPanel(item, ui, suppress_label=True)
-            page = gp.control
-            sub_page = gp.sub_control
-
-            # If the result is the same type with only one page, collapse it
-            # down into just the page.
-            if type(sub_page) is type(panel) and sub_page.count() == 1:
-                new = sub_page.getWidget(0)
-                if isinstance(panel, TabPanel):
-                    sub_page.remove(sub_page.getWidget(0))
-                else:
-                    sub_page.remove(sub_page.getWidget(0))
-            elif isinstance(page, Widget):
-                new = page
-            else:
-                new = Widget()
-                new.setLayoutData(page)
-
-            layout = new.getLayoutData()
-#            if layout is not None:
-#                layout.setAlignment(QtCore.Qt.AlignLeft|QtCore.Qt.AlignTop)
-
+        if lazy and plan.is_group and (index != active):
+            # Add a placeholder that is filled when the page is selected:
+            new = SimplePanel()
+            pages[index] = (new, plan, item)
+            ui._panel_parts.deferred += 1
         else:
-            new = Widget()
-            layout = VerticalPanel()
-            layout.setBorderWidth(0)
-            item_handler(item, layout)
+            new = _create_page(panel, plan, item, ui, item_handler, scroller)
 
         # Add the content.
         if isinstance(panel, TabPanel):
@@ -140,8 +174,137 @@ def _fill_panel(panel, content, ui, item_handler=None):
         else:
             panel.add(new)
 
+    if len(pages) > 0:
+        _LazyPages(panel, pages, ui, scroller)
+
     panel.selectTab( active )
 
+#-------------------------------------------------------------------------------
+#  Creates the content of a single page of a page based container panel:
+#-------------------------------------------------------------------------------
+
+def _create_page(panel, plan, item, ui, item_handler=None, scroller=None):
+    """ Creates the content of a single page of a page based container panel
+        for a Group or Item and its plan.
+    """
+    if plan.is_group:
+        gp = _GroupPanel(item, ui, suppress_label=True, plan=plan,
+                         scroller=scroller)
+        page = gp.control
+        sub_page = gp.sub_control
+
+        # If the result is the same type with only one page, collapse it
+        # down into just the page.
+        if type(sub_page) is type(panel) and sub_page.count() == 1:
+            new = sub_page.getWidget(0)
+            if isinstance(panel, TabPanel):
+                sub_page.remove(sub_page.getWidget(0))
+            else:
+                sub_page.remove(sub_page.getWidget(0))
+        elif isinstance(page, Widget):
+            new = page
+        else:
+            new = Widget()
+            new.setLayoutData(page)
+
+        layout = new.getLayoutData()
+#        if layout is not None:
+#            layout.setAlignment(QtCore.Qt.AlignLeft|QtCore.Qt.AlignTop)
+
+    else:
+        new = Widget()
+        layout = VerticalPanel()
+        layout.setBorderWidth(0)
+        item_handler(item, layout)
+
+    return new
+
+#-------------------------------------------------------------------------------
+#  Completes the editors added to a UI after it has been built:
+#-------------------------------------------------------------------------------
+
+def _complete_editors(ui, n_defined):
+    """ Completes the editors added to a UI after it was built, as if they
+        had been built with it. n_defined is the length of the UI's list of
+        'name_defined' methods before the editors were created.
+    """
+    defined = ui._defined[n_defined:]
+    del ui._defined[n_defined:]
+    for method in defined:
+        method(ui.info)
+
+#-------------------------------------------------------------------------------
+#  "_LazyPages" class:
+#-------------------------------------------------------------------------------
+
+class _LazyPages(object):
+    """ Builds the pages of a tabbed panel when they are first selected and,
+        optionally, in the background once the panel has been shown.
+    """
+
+    def __init__(self, panel, pages, ui, scroller=None):
+        """ Initialise the object.
+        """
+        self.panel = panel
+        self.ui = ui
+        self.scroller = scroller
+
+        # Mapping of page index to ( placeholder, plan, Group or Item ) for
+        # unbuilt pages:
+        self.pages = pages
+
+        panel.addTabListener(self)
+
+        # Schedule building the remaining pages when idle (if requested):
+        self.delay = toolkit().tab_prefetch_delay
+        if self.delay >= 0:
+            Timer(notify=self._on_prefetch).schedule(self.delay)
+
+    def onBeforeTabSelected(self, sender, index):
+        """ Builds a page before it is shown for the first time.
+        """
+        self.create_page(index)
+
+        return True
+
+    def onTabSelected(self, sender, index):
+        pass
+
+    def create_page(self, index):
+        """ Builds the content of an unbuilt page.
+        """
+        page = self.pages.pop(index, None)
+        if page is None:
+            return
+
+        placeholder, plan, item = page
+        ui = self.ui
+
+        # Remember which 'name_defined' methods are new to this page:
+        n = len(ui._defined)
+
+        placeholder.setWidget(_create_page(self.panel, plan, item, ui,
+                                           scroller=self.scroller))
+
+        _complete_editors(ui, n)
+
+    def _on_prefetch(self, timer):
+        """ Builds one unbuilt page each time the panel is idle.
+        """
+        # Stop once all pages are built or the UI has been disposed of:
+        if (len(self.pages) == 0) or (self.ui.info.ui is None):
+            return
+
+        # Wait until the panel has been shown before building any pages:
+        if not self.panel.isAttached():
+            timer.schedule(self.delay)
+            return
+
+        self.create_page(min(self.pages.keys()))
+
+        if len(self.pages) > 0:
+            timer.schedule(self.delay)
+
 #------------------------------------------------------------------------------
 #  "GroupPanel" class:
 #------------------------------------------------------------------------------
@@ -151,17 +314,56 @@ class _GroupPanel(object):
         widget.
     """
 
-    def __init__(self, group, ui, suppress_label=False):
+    def __init__(self, group, ui, suppress_label=False, plan=None,
+                 scroller=None):
         """Initialise the object.
         """
-        # Get the contents of the group:
-        content = group.get_content()
+        # Record the building of the group if it is being profiled:
+        profiler = toolkit().profiler
+        if profiler is not None:
+            span = profiler.begin('group', group.label or group.id)
+
+        # Get the compiled layout plan of the group:
+        if plan is None:
+            plan = plan_for(group)
+
+        # Reuse the panel of an unchanged group retained from the panel being
+        # replaced (if any):
+        parts = ui._panel_parts
+        key = (plan.signature, suppress_label)
+        reused = parts.reuse_group(key)
+        if reused is not None:
+            self.group = group
+            self.plan = plan
+            self.ui = ui
+            self.scroller = scroller
+            self.is_horizontal = plan.is_horizontal
+            self.control, entries = reused
+            self.sub_control = None
+
+            start = len(parts.log)
+            self._replay(entries)
+            parts.add_group(key, self.control, parts.log[start:])
+
+            if profiler is not None:
+                profiler.end(span, self.control)
+
+            return
+
+        # Remember where the parts built for this group start:
+        start = len(parts.log)
+        deferred = parts.deferred
+
+        # Get the (compiled) contents of the group:
+        content = plan.content
 
         # Save these for other methods.
         self.group = group
+        self.plan = plan
         self.ui = ui
+        self.scroller = scroller
 
-        self.is_horizontal = (group.orientation == 'horizontal')
+        self.is_horizontal = plan.is_horizontal
 
         # outer is the top-level widget or layout that will eventually be
         # returned.  sub is the QTabWidget or QToolBox corresponding to any
@@ -190,14 +392,14 @@ class _GroupPanel(object):
             inner.add(HeadingText(None, text=label).control)
 
         # Add the layout specific content.
-        if len(content) == 0:
+        if plan.layout == 'empty':
             pass
 
-        elif group.layout == 'flow':
+        elif plan.layout == 'flow':
             outer = inner = FlowPanel()
             raise NotImplementedError, "'the 'flow' layout isn't implemented"
 
-        elif group.layout == 'split':
+        elif plan.layout == 'split':
             # Create the splitter.
             if self.is_horizontal:
                 splitter = HorizontalSplitPanel()
@@ -230,9 +432,9 @@ class _GroupPanel(object):
 
             self._add_splitter_items(content, splitter)
 
-        elif group.layout in ('tabbed', 'fold'):
+        elif plan.layout in ('tabbed', 'fold'):
             # Create the TabWidget or ToolBox.
-            if group.layout == 'tabbed':
+            if plan.layout == 'tabbed':
                 sub = TabPanel()
             else:
                 print "Fold layout not implemented."
@@ -245,7 +447,8 @@ class _GroupPanel(object):
 #            policy.setVerticalStretch(50)
 #            sub.setSizePolicy(policy)
 
-            _fill_panel(sub, content, self.ui, self._add_page_item)
+            _fill_panel(sub, plan.bind(group), self.ui, self._add_page_item,
+                        self.scroller)
 
             if outer is None:
                 outer = sub
@@ -258,7 +461,7 @@ class _GroupPanel(object):
 
         else:
             # See if we need to control the visual appearence of the group.
-            if group.visible_when != '' or group.enabled_when != '':
+            if plan.is_conditional:
                 # Make sure that outer is a widget or a layout.
                 if outer is None:
                     if self.is_horizontal:
@@ -269,8 +472,10 @@ class _GroupPanel(object):
                 # Create an editor.
                 self._setup_editor(group, GroupEditor(control=outer))
 
-            if isinstance(content[0], Group):
-                layout = self._add_groups(content, inner)
+            if plan.layout == 'groups':
+                layout = self._add_groups(plan.bind(group), inner)
+            elif self._is_virtual(content):
+                layout = self._add_virtual_items(content, inner)
             else:
                 layout = self._add_items(content, inner)
 #            layout.setAlignment(QtCore.Qt.AlignLeft | QtCore.Qt.AlignTop)
@@ -286,23 +491,42 @@ class _GroupPanel(object):
         # Publish the optional sub-control.
         self.sub_control = sub
 
+        # Record the group for reuse, unless some of it is still to be built
+        # or it may be collapsed into its parent:
+        if (sub is None) and (parts.deferred == deferred):
+            parts.add_group(key, outer, parts.log[start:])
+
+        if profiler is not None:
+            profiler.end(span, outer)
+
+
+    def _replay(self, entries):
+        """ Registers the editors of a reused group with the UI again.
+        """
+        for kind, plan, label, editor in entries:
+            if kind == 'editor':
+                self._register_editor(plan, label, editor)
+            else:
+                self._setup_editor(plan, editor)
 
     def _setup_editor(self, group, editor):
         """Setup the editor for a group.
         """
+        self.ui._panel_parts.log.append(('group', group, None, editor))
+
         if group.id != '':
             self.ui.info.bind(group.id, editor)
 
         if group.visible_when != '':
-            self.ui.add_visible(group.visible_when, editor)
+            self.ui._conditions.add(group.visible_when, editor, 'visible')
 
         if group.enabled_when != '':
-            self.ui.add_enabled(group.enabled_when, editor)
+            self.ui._conditions.add(group.enabled_when, editor, 'enabled')
 
 
     def _add_groups(self, content, outer):
-        """ Adds a list of Group objects to the panel, creating a layout if
-            needed.  Return the outermost layout.
+        """ Adds a list of ( plan, Group ) pairs to the panel, creating a
+            layout if needed.  Return the outermost layout.
         """
         # Use the existing layout if there is one.
         if outer is None:
@@ -312,8 +536,9 @@ class _GroupPanel(object):
                 outer = inner = VerticalPanel()
 
         # Process each group.
-        for subgroup in content:
-            panel = _GroupPanel(subgroup, self.ui).control
+        for plan, group in content:
+            panel = _GroupPanel(group, self.ui, plan=plan,
+                                scroller=self.scroller).control
 
             if isinstance(panel, Widget):
                 outer.add(panel)
@@ -324,14 +549,43 @@ class _GroupPanel(object):
 
         return outer
 
+    def _is_virtual(self, content):
+        """ Returns whether only the visible rows of a list of Item objects
+            should be rendered.
+        """
+        size = toolkit().virtual_group_size
+
+        return ((self.scroller is not None) and (not self.is_horizontal) and
+                (self.group.columns == 1) and (0 < size <= len(content)))
+
+    def _add_virtual_items(self, content, outer=None):
+        """ Adds a list of Item objects of which only the rows near the
+            visible area of the scroll panel are rendered.  Return the
+            outermost layout.
+        """
+        profiler = toolkit().profiler
+        if profiler is not None:
+            span = profiler.begin('virtual items', self.group.label)
+
+        control = _VirtualItems(self, content, self.scroller).control
+
+        if profiler is not None:
+            profiler.end(span, control)
+
+        if outer is None:
+            return control
+
+        outer.add(control)
+
+        return outer
+
     def _add_items(self, content, outer=None):
         """Adds a list of Item objects, creating a layout if needed.  Return
            the outermost layout.
         """
-        # Get local references to various objects we need:
-        ui = self.ui
-        info = ui.info
-        handler = ui.handler
+        profiler = toolkit().profiler
+        if profiler is not None:
+            span = profiler.begin('items', self.group.label)
 
         group = self.group
         show_left = group.show_left
@@ -339,9 +593,7 @@ class _GroupPanel(object):
         columns = group.columns
 
         # See if a label is needed.
-        show_labels = False
-        for item in content:
-            show_labels |= item.show_label
+        show_labels = self.plan.show_labels
 
         # See if a grid layout is needed.
         if show_labels or columns > 1:
@@ -350,10 +602,9 @@ class _GroupPanel(object):
 #            inner.getFlexCellFormatter().setHorizontalAlignment(0, 0,
 #                HasHorizontalAlignment.ALIGN_CENTER)
 
-            if outer is None:
-                outer = inner
-            else:
-                outer.add(inner)
+            # Collect the cells so that the table can be built in one pass
+            # once all of the items have been processed:
+            layout = _GridBuilder(inner)
 
             row = 0
             if show_left:
@@ -369,14 +620,15 @@ class _GroupPanel(object):
                 else:
                     outer = inner = VerticalPanel()
 
-            inner = outer
+            inner = layout = outer
 
             row = -1
             label_alignment = HasHorizontalAlignment.ALIGN_LEFT
 
         # Process each Item in the list:
         col = -1
-        for item in content:
+        for plan in content:
+            item = plan.item
 
             # Keep a track of the current logical row and column unless the
             # layout is not a grid.
@@ -385,30 +637,20 @@ class _GroupPanel(object):
                 col = 0
                 row += 1
 
-            # Get the name in order to determine its type:
-            name = item.name
+            # Get the type of the item:
+            kind = plan.kind
 
             # Check if is a label:
-            if name == '':
-                label = item.label
-                if label != "":
-
-                    # Create the label widget.
-                    if item.style == 'simple':
-                        label = Label(label)
-                    else:
-                        label = HeadingText(None, text=label).control
-
-                    self._add_widget(inner, label, row, col, show_labels)
-
-                    if item.emphasized:
-                        self._add_emphasis(label)
+            if kind == 'label':
+                label = self._create_text_label(plan)
+                if label is not None:
+                    self._add_widget(layout, label, row, col, show_labels)
 
                 # Continue on to the next Item in the list:
                 continue
 
             # Check if it is a separator:
-            if name == '_':
+            if kind == 'separator':
                 cols = columns
 
                 # See if the layout is a grid.
@@ -448,12 +690,8 @@ class _GroupPanel(object):
                 # Continue on to the next Item in the list:
                 continue
 
-            # Convert a blank to a 5 pixel spacer:
-            if name == ' ':
-                name = '5'
-
             # Check if it is a spacer:
-            if all_digits.match( name ):
+            if kind == 'spacer':
 
                 # If so, add the appropriate amount of space to the layout:
 #                n = int( name )
@@ -464,7 +702,7 @@ class _GroupPanel(object):
 #                    # Add a vertical spacer:
 #                    spacer = QtGui.QSpacerItem(1, n)
 #
-#                self._add_widget(inner, spacer, row, col, show_labels)
+#                self._add_widget(layout, spacer, row, col, show_labels)
 
                 print "Spacers are not implemented."
 
@@ -472,163 +710,221 @@ class _GroupPanel(object):
                 continue
 
             # Otherwise, it must be a trait Item:
-            object      = eval( item.object_, globals(), ui.context )
-            trait       = object.base_trait( name )
-            desc        = trait.desc or ''
-            fixed_width = False
+            label, editor = self._create_editor(plan, inner)
 
             # Handle any label.
-            if item.show_label:
-                label = self._create_label(item, ui, desc)
-                self._add_widget(inner, label, row, col, show_labels,
+            if label is not None:
+                self._add_widget(layout, label, row, col, show_labels,
                                  label_alignment)
 
                 col += 1
 
+            # FIXME: Need to decide what to do about border_size and padding
+            self._add_widget(layout, editor.control, row, col, show_labels)
+
+        # Build the grid (if any) before it is attached to the panel:
+        if row >= 0:
+            layout.build()
+
+            if outer is None:
+                outer = inner
             else:
-                label = None
-
-            # Get the editor factory associated with the Item:
-            editor_factory = item.editor
-            if editor_factory is None:
-                editor_factory = trait.get_editor()
-
-                # If still no editor factory found, use a default text editor:
-                if editor_factory is None:
-                    from text_editor import ToolkitEditorFactory
-                    editor_factory = ToolkitEditorFactory()
-
-                # If the item has formatting traits set them in the editor
-                # factory:
-                if item.format_func is not None:
-                    editor_factory.format_func = item.format_func
-
-                if item.format_str != '':
-                    editor_factory.format_str = item.format_str
-
-                # If the item has an invalid state extended trait name, set it
-                # in the editor factory:
-                if item.invalid != '':
-                    editor_factory.invalid = item.invalid
-
-            # Create the requested type of editor from the editor factory:
-            factory_method = getattr( editor_factory, item.style + '_editor' )
-            editor         = factory_method( ui, object, name, item.tooltip,
-                                        None).set(
-                                 item        = item,
-                                 object_name = item.object )
-
-            # Tell the editor to actually build the editing widget.  Note that
-            # "inner" is a layout.  This shouldn't matter as individual editors
-            # shouldn't be using it as a parent anyway.  The important thing is
-            # that it is not None (otherwise the main TraitsUI code can change
-            # the "kind" of the created UI object).
-            editor.prepare(inner)
-            control = editor.control
-
-            # Set the initial 'enabled' state of the editor from the factory:
-            editor.enabled = editor_factory.enabled
-
-            # Add emphasis to the editor control if requested:
-            if item.emphasized:
-                self._add_emphasis(control)
-
-            # Give the editor focus if it requested it:
-            if item.has_focus:
-#                control.setFocus()
-                print "Item 'has_focus' not implemented."
-
-            # Set the correct size on the control, as specified by the user:
-            stretch = 0
-            scrollable = editor.scrollable
-            item_width = item.width
-            item_height = item.height
-            if (item_width != -1) or (item_height != -1):
-#                min_size = control.minimumSizeHint()
-#                width = min_size.width()
-#                height = min_size.height()
-                height = width = 0
-
-                if (0.0 < item_width <= 1.0) and self.is_horizontal:
-                    stretch = int(100 * item_width)
-
-                item_width = int(item_width)
-                if item_width < -1:
-                    item_width  = -item_width
-                else:
-                    item_width = max(item_width, width)
+                outer.add(inner)
 
-                if (0.0 < item_height <= 1.0) and (not self.is_horizontal):
-                    stretch = int(100 * item_height)
+        if profiler is not None:
+            profiler.end(span, inner)
 
-                item_height = int(item_height)
-                if item_height < -1:
-                    item_height = -item_height
-                else:
-                    item_height = max(item_height, height)
-
-#                control.setMinimumWidth(item_width)
-#                control.setMinimumHeight(item_height)
-                control.setWidth(item_width)
-                control.setHeight(item_height)
-
-            # Bind the editor into the UIInfo object name space so it can be
-            # referred to by a Handler while the user interface is active:
-            id = item.id or name
-            info.bind( id, editor, item.id )
-
-            # Also, add the editors to the list of editors used to construct
-            # the user interface:
-            ui._editors.append( editor )
-
-            # If the handler wants to be notified when the editor is created,
-            # add it to the list of methods to be called when the UI is
-            # complete:
-            defined = getattr( handler, id + '_defined', None )
-            if defined is not None:
-                ui.add_defined( defined )
-
-            # If the editor is conditionally visible, add the visibility
-            # 'expression' and the editor to the UI object's list of monitored
-            # objects:
-            if item.visible_when != '':
-                ui.add_visible( item.visible_when, editor )
-
-            # If the editor is conditionally enabled, add the enabling
-            # 'expression' and the editor to the UI object's list of monitored
-            # objects:
-            if item.enabled_when != '':
-                ui.add_enabled( item.enabled_when, editor )
-
-            # Add the created editor control to the layout with the appropriate
-            # size and stretch policies:
-#            ui._scrollable |= scrollable
-#            item_resizable  = ((item.resizable is True) or
-#                               ((item.resizable is Undefined) and scrollable))
-#            if item_resizable:
-#                stretch = stretch or 50
-#                self.resizable = True
-#            elif item.springy:
-#                stretch = stretch or 50
-#            policy = control.sizePolicy()
-#            if self.direction == QtGui.QBoxLayout.LeftToRight:
-#                policy.setHorizontalStretch(stretch)
-#                if item_resizable or item.springy:
-#                    policy.setHorizontalPolicy(QtGui.QSizePolicy.Expanding)
-#            else:
-#                policy.setVerticalStretch(stretch)
-#                if item_resizable or item.springy:
-#                    policy.setVerticalPolicy(QtGui.QSizePolicy.Expanding)
-#            control.setSizePolicy(policy)
+        return outer
 
-            # FIXME: Need to decide what to do about border_size and padding
-            self._add_widget(inner, control, row, col, show_labels)
 
-            # Save the reference to the label control (if any) in the editor:
-            editor.label_control = label
+    def _create_editor(self, plan, inner, record=True):
+        """ Creates the editor (and any label) for a trait Item and returns
+            them as a tuple of the form: ( label, editor ).
+        """
+        # Get local references to various objects we need:
+        ui = self.ui
+        item = plan.item
+        name = plan.name
 
-        return outer
+        object = evaluate_expression( item.object_, globals(), ui.context )
 
+        # Reuse the editor of an unchanged item for the same object retained
+        # from the panel being replaced (if any):
+        reused = ui._panel_parts.reuse_editor(plan.signature, object)
+        if reused is not None:
+            label, editor = reused
+            self._register_editor(plan, label, editor, record)
+
+            return (label, editor)
+
+        trait       = object.base_trait( name )
+        desc        = trait.desc or ''
+        fixed_width = False
+
+        # Create any label.
+        if item.show_label:
+            label = self._create_label(item, ui, desc)
+        else:
+            label = None
+
+        # Get the editor factory associated with the Item, or else the
+        # (cached) default editor factory of the trait:
+        editor_factory = item.editor
+        if editor_factory is None:
+            editor_factory, factory_method = factory_cache.get( trait, item,
+                                                         plan.factory_method )
+        else:
+            factory_method = getattr( editor_factory, plan.factory_method )
+
+        # Create the requested type of editor from the editor factory:
+        editor         = factory_method( ui, object, name, item.tooltip,
+                                    None).set(
+                             item        = item,
+                             object_name = item.object )
+
+        # Tell the editor to actually build the editing widget.  Note that
+        # "inner" is a layout.  This shouldn't matter as individual editors
+        # shouldn't be using it as a parent anyway.  The important thing is
+        # that it is not None (otherwise the main TraitsUI code can change
+        # the "kind" of the created UI object).
+        editor.prepare(inner)
+        control = editor.control
+
+        # Set the initial 'enabled' state of the editor from the factory:
+        editor.enabled = editor_factory.enabled
+
+        # Add emphasis to the editor control if requested:
+        if item.emphasized:
+            self._add_emphasis(control)
+
+        # Give the editor focus if it requested it:
+        if item.has_focus:
+#            control.setFocus()
+            print "Item 'has_focus' not implemented."
+
+        # Set the correct size on the control, as specified by the user:
+        stretch = 0
+        scrollable = editor.scrollable
+        item_width = item.width
+        item_height = item.height
+        if (item_width != -1) or (item_height != -1):
+#            min_size = control.minimumSizeHint()
+#            width = min_size.width()
+#            height = min_size.height()
+            height = width = 0
+
+            if (0.0 < item_width <= 1.0) and self.is_horizontal:
+                stretch = int(100 * item_width)
+
+            item_width = int(item_width)
+            if item_width < -1:
+                item_width  = -item_width
+            else:
+                item_width = max(item_width, width)
+
+            if (0.0 < item_height <= 1.0) and (not self.is_horizontal):
+                stretch = int(100 * item_height)
+
+            item_height = int(item_height)
+            if item_height < -1:
+                item_height = -item_height
+            else:
+                item_height = max(item_height, height)
+
+#            control.setMinimumWidth(item_width)
+#            control.setMinimumHeight(item_height)
+            control.setWidth(item_width)
+            control.setHeight(item_height)
+
+        self._register_editor( plan, label, editor, record )
+
+        # Add the created editor control to the layout with the appropriate
+        # size and stretch policies:
+#        ui._scrollable |= scrollable
+#        item_resizable  = ((item.resizable is True) or
+#                           ((item.resizable is Undefined) and scrollable))
+#        if item_resizable:
+#            stretch = stretch or 50
+#            self.resizable = True
+#        elif item.springy:
+#            stretch = stretch or 50
+#        policy = control.sizePolicy()
+#        if self.direction == QtGui.QBoxLayout.LeftToRight:
+#            policy.setHorizontalStretch(stretch)
+#            if item_resizable or item.springy:
+#                policy.setHorizontalPolicy(QtGui.QSizePolicy.Expanding)
+#        else:
+#            policy.setVerticalStretch(stretch)
+#            if item_resizable or item.springy:
+#                policy.setVerticalPolicy(QtGui.QSizePolicy.Expanding)
+#        control.setSizePolicy(policy)
+
+        return (label, editor)
+
+    def _register_editor(self, plan, label, editor, record=True):
+        """ Registers the editor (and any label) created for a trait Item with
+            the UI. Unless 'record' is False (e.g. for the short lived editors
+            of virtual rows), the editor is also recorded for reuse.
+        """
+        ui = self.ui
+        item = plan.item
+
+        if record:
+            ui._panel_parts.log.append(('editor', plan, label, editor))
+
+        # A reused editor may have been created for a UI it replaces:
+        if editor.ui is not ui:
+            editor.ui = ui
+
+        # Bind the editor into the UIInfo object name space so it can be
+        # referred to by a Handler while the user interface is active:
+        ui.info.bind( plan.id, editor, item.id )
+
+        # Also, add the editors to the list of editors used to construct
+        # the user interface:
+        ui._editors.append( editor )
+
+        # If the handler wants to be notified when the editor is created,
+        # add it to the list of methods to be called when the UI is
+        # complete:
+        defined = getattr( ui.handler, plan.defined, None )
+        if defined is not None:
+            ui.add_defined( defined )
+
+        # Save the reference to the label control (if any) in the editor:
+        editor.label_control = label
+
+        # If the editor is conditionally visible, add the visibility
+        # 'expression' and the editor to the UI object's monitored
+        # conditions:
+        if item.visible_when != '':
+            ui._conditions.add( item.visible_when, editor, 'visible' )
+
+        # If the editor is conditionally enabled, add the enabling
+        # 'expression' and the editor to the UI object's monitored
+        # conditions:
+        if item.enabled_when != '':
+            ui._conditions.add( item.enabled_when, editor, 'enabled' )
+
+    def _create_text_label(self, plan):
+        """ Creates the widget for a label Item, or returns None if the Item
+            has no label text.
+        """
+        item = plan.item
+        label = item.label
+        if label == "":
+            return None
+
+        # Create the label widget.
+        if item.style == 'simple':
+            label = Label(label)
+        else:
+            label = HeadingText(None, text=label).control
+
+        if item.emphasized:
+            self._add_emphasis(label)
+
+        return label
 
     def _add_widget(self, layout, w, row, column, show_labels,
                     label_alignment=HasHorizontalAlignment.ALIGN_RIGHT):
@@ -660,15 +956,7 @@ class _GroupPanel(object):
                     or (label_alignment == "right" and self.group.show_left):
                     column += 1
 
-            if isinstance(w, Widget):
-                layout.setWidget(row, column, w)
-                layout.getFlexCellFormatter().setHorizontalAlignment(row,
-                    column, label_alignment)
-
-            else:
-                layout.addWidget(row, column, w)
-                layout.getFlexCellFormatter().setHorizontalAlignment(row,
-                    column, label_alignment)
+            layout.add_cell(row, column, w, label_alignment)
 
 
     def _create_label(self, item, ui, desc, suffix = ':'):
@@ -699,6 +987,617 @@ class _GroupPanel(object):
         """
         print "Emphasis is not implemented."
 
+#-------------------------------------------------------------------------------
+#  "_VirtualItems" class:
+#-------------------------------------------------------------------------------
+
+class _VirtualItems(object):
+    """ Renders only the rows of a large list of Item objects that are in or
+        near the visible area of a scroll panel. The editors of rows that are
+        scrolled out of range are disposed of and created again when they
+        come back into range.
+    """
+
+    def __init__(self, group_panel, content, scroller):
+        """ Initialise the object.
+        """
+        tk = toolkit()
+        ui = group_panel.ui
+
+        self.group_panel = group_panel
+        self.content = content
+        self.scroller = scroller
+        self.row_height = tk.virtual_row_height
+        self.margin = tk.virtual_margin
+
+        if group_panel.group.show_left:
+            self.label_alignment = HasHorizontalAlignment.ALIGN_RIGHT
+        else:
+            self.label_alignment = HasHorizontalAlignment.ALIGN_LEFT
+
+        # Mapping of item index to ( label, control, editor ) for each row
+        # that is currently rendered:
+        self.rows = {}
+        self.first = self.last = 0
+
+        # The rendered rows are shown in a table between two spacers that
+        # stand in for the rows above and below them:
+        self.top = SimplePanel()
+        self.table = FlexTable(Width="100%")
+        self.bottom = SimplePanel()
+
+        self.control = control = _VirtualPanel(self, Width="100%")
+        control.add(self.top)
+        control.add(self.table)
+        control.add(self.bottom)
+
+        # The scroll panel must have a fixed height, otherwise it grows to fit
+        # all of the rows and is never scrolled:
+        height = ui.view.height
+        if height <= 1:
+            height = tk.virtual_viewport_height
+        scroller.setHeight("%dpx" % int(height))
+
+        scroller.addScrollListener(self)
+
+        # Stop rendering rows when the UI is disposed of:
+        ui._editors.append(_Disposer(_target=self))
+
+        # Rows are built (and disposed of) after the group has been built:
+        ui._panel_parts.deferred += 1
+
+        # The visible area is not known until the panel is shown, so start
+        # with the rows at the top. Their editors are completed along with
+        # the rest of the UI:
+        self._render(0, min(len(content), 2 * self.margin))
+
+    def dispose(self):
+        """ Stops rendering the rows of the items.
+        """
+        if self.scroller is not None:
+            self.scroller.removeScrollListener(self)
+            self.scroller = None
+
+    def refresh(self):
+        """ Renders the rows near the visible area of the scroll panel (e.g.
+            once it has been shown).
+        """
+        scroller = self.scroller
+        if scroller is not None:
+            self.onScroll(scroller, 0, scroller.getScrollPosition())
+
+    def onScroll(self, sender, left, top):
+        """ Renders the rows near the visible area of the scroll panel.
+        """
+        scroller = self.scroller
+        height = self.row_height
+        n = len(self.content)
+
+        # Get the position of the first row within the scrolled content:
+        offset = (self.control.getAbsoluteTop() -
+                  scroller.getAbsoluteTop() + top)
+
+        first = (top - offset) // height
+        last = first + (scroller.getOffsetHeight() // height) + 1
+
+        self.render(max(0, min(n, first - self.margin)),
+                    max(0, min(n, last + self.margin)))
+
+    def render(self, first, last):
+        """ Renders the rows of the items with indices from first up to (but
+            not including) last.
+        """
+        if (first, last) == (self.first, self.last):
+            return
+
+        ui = self.group_panel.ui
+        n_defined = len(ui._defined)
+
+        self._render(first, last)
+
+        _complete_editors(ui, n_defined)
+
+    def _render(self, first, last):
+        """ Renders the rows of the items in a range, only removing the rows
+            which are now out of range and adding those which are new to it.
+        """
+        old_first, old_last = self.first, self.last
+        if (first >= old_last) or (last <= old_first):
+            # None of the rendered rows are still in range:
+            for index in range(old_last - 1, old_first - 1, -1):
+                self._remove_row(index, index - old_first)
+            old_first = old_last = first
+        else:
+            # Remove the rows after the range, then those before it:
+            for index in range(old_last - 1, last - 1, -1):
+                self._remove_row(index, index - old_first)
+            for index in range(old_first, first):
+                self._remove_row(index, 0)
+
+        # Add the rows before the rendered rows, then those after them:
+        for index in range(min(old_first, last) - 1, first - 1, -1):
+            self._insert_row(index, 0)
+        for index in range(max(old_last, first), last):
+            self._insert_row(index, index - first)
+
+        height = self.row_height
+        self.top.setHeight("%dpx" % (first * height))
+        self.bottom.setHeight("%dpx" % ((len(self.content) - last) * height))
+
+        self.first, self.last = first, last
+
+    def _insert_row(self, index, row):
+        """ Creates the row of the item with the specified index and inserts
+            it into the table at the specified row.
+        """
+        widgets = self.rows[index] = self._create_row(self.content[index],
+                                                      self.table)
+
+        self.table.insertRow(row)
+        grid = _GridBuilder(self.table)
+        self._add_row(grid, row, widgets)
+        grid.build()
+
+    def _remove_row(self, index, row):
+        """ Removes the row of the item with the specified index from the
+            specified row of the table, disposing of its editor.
+        """
+        label, control, editor = self.rows.pop(index)
+        self.table.removeRow(row)
+        if editor is not None:
+            self._dispose_editor(editor)
+
+    def _create_row(self, plan, inner):
+        """ Creates the widgets of a row as a tuple of the form:
+            ( label, control, editor ).
+        """
+        kind = plan.kind
+        if kind == 'label':
+            return (self.group_panel._create_text_label(plan), None, None)
+
+        if kind != 'trait':
+            # Separators and spacers are not implemented.
+            return (None, None, None)
+
+        # The editors of rows are not recorded for reuse, as they come and go
+        # as the rows are scrolled:
+        label, editor = self.group_panel._create_editor(plan, inner,
+                                                        record=False)
+
+        return (label, editor.control, editor)
+
+    def _add_row(self, grid, row, widgets):
+        """ Adds the widgets of a row to a grid.
+        """
+        gp = self.group_panel
+        show_labels = gp.plan.show_labels
+        label, control, editor = widgets
+
+        col = 0
+        if label is not None:
+            if control is None:
+                gp._add_widget(grid, label, row, col, show_labels)
+            else:
+                gp._add_widget(grid, label, row, col, show_labels,
+                               self.label_alignment)
+                col += 1
+
+        if control is not None:
+            gp._add_widget(grid, control, row, col, show_labels)
+
+    def _dispose_editor(self, editor):
+        """ Disposes of the editor of a row that is out of range.
+        """
+        ui = self.group_panel.ui
+        ui._editors.remove(editor)
+
+        # Stop monitoring any conditions on the editor:
+        ui._conditions.remove(editor)
+
+        editor.dispose()
+
+#-------------------------------------------------------------------------------
+#  "_VirtualPanel" class:
+#-------------------------------------------------------------------------------
+
+class _VirtualPanel(VerticalPanel):
+    """ The panel of a virtual group, which renders the rows near the visible
+        area once it has been shown.
+    """
+
+    def __init__(self, items, **kwargs):
+        """ Initialise the object.
+        """
+        VerticalPanel.__init__(self, **kwargs)
+
+        self.items = items
+
+    def onLoad(self):
+        """ Renders the visible rows once the panel has been attached.
+        """
+        self.items.refresh()
+
+#-------------------------------------------------------------------------------
+#  "_Conditions" class:
+#-------------------------------------------------------------------------------
+
+class _Conditions(object):
+    """ The 'visible_when' and 'enabled_when' conditions of the editors of a
+        UI. Each condition is only re-evaluated when a trait whose name it
+        refers to changes, rather than whenever any trait of the context
+        changes.
+    """
+
+    @classmethod
+    def install(cls, ui):
+        """ Installs a new set of conditions for a UI that is being built,
+            replacing any left from a previous build.
+        """
+        conditions = getattr(ui, '_conditions', None)
+        if conditions is not None:
+            conditions.dispose()
+
+        ui._conditions = cls(ui)
+
+    def __init__(self, ui):
+        """ Initialise the object.
+        """
+        self.ui = ui
+
+        # Mapping of a name to the conditions referring to it:
+        self.dependents = {}
+
+        # The conditions which may depend upon any trait:
+        self.anything = []
+
+        # Mapping of an editor to its conditions:
+        self.editors = {}
+
+        # The context the conditions are evaluated in (created when the first
+        # condition is added):
+        self.context = None
+
+    def add(self, when, editor, trait):
+        """ Adds a condition controlling the specified trait of an editor,
+            and sets the trait from the current value of the condition.
+        """
+        if self.context is None:
+            self._hook()
+
+        names, code = compile_expression(when)
+        names = expression_dependencies(code, self.ui.context.values())
+        condition = (when, code, editor, trait, names)
+
+        if names is None:
+            self.anything.append(condition)
+        else:
+            for name in names:
+                self.dependents.setdefault(name, []).append(condition)
+
+        self.editors.setdefault(editor, []).append(condition)
+
+        self._evaluate(condition)
+
+    def remove(self, editor):
+        """ Removes all of the conditions of an editor.
+        """
+        for condition in self.editors.pop(editor, []):
+            names = condition[4]
+            if names is None:
+                self.anything.remove(condition)
+                continue
+
+            for name in names:
+                conditions = self.dependents[name]
+                conditions.remove(condition)
+                if len(conditions) == 0:
+                    del self.dependents[name]
+
+    def dispose(self):
+        """ Stops monitoring all of the conditions.
+        """
+        if self.context is not None:
+            for object in self.ui.context.values():
+                object.on_trait_change(self._trait_changed, remove=True)
+
+        self.dependents = {}
+        self.anything = []
+        self.editors = {}
+        self.context = None
+
+    def _hook(self):
+        """ Creates the evaluation context and starts monitoring the objects
+            in the UI's context.
+        """
+        ui = self.ui
+        context = ui.context
+
+        # The conditions are evaluated in the same context the UI uses, in
+        # which the traits of the main object can be referred to directly:
+        self.context = ui._get_context(context)
+        name = 'object'
+        if len(context) == 1:
+            name = context.keys()[0]
+        self._object = context.get(name)
+
+        for object in context.values():
+            object.on_trait_change(self._trait_changed, dispatch='ui')
+
+        # Stop monitoring the objects when the UI is disposed of:
+        ui._editors.append(_Disposer(_target=self))
+
+    def _trait_changed(self, object, name, old, new):
+        """ Handles a trait of an object in the UI's context changing.
+        """
+        if self.ui.info.ui is None:
+            # The UI has been disposed of:
+            self.dispose()
+            return
+
+        # Keep the traits of the main object in the context up to date:
+        if (object is self._object) and (name not in self.ui.context):
+            self.context[name] = new
+
+        conditions = self.dependents.get(name, [])[:]
+
+        # Changes to the items of a list also affect conditions on the list
+        # (the name may also be that of a trait actually ending in '_items'):
+        if name.endswith('_items'):
+            for condition in self.dependents.get(name[:-6], []):
+                if condition not in conditions:
+                    conditions.append(condition)
+
+        for condition in conditions:
+            self._evaluate(condition)
+
+        # The conditions which may depend upon any trait are evaluated in an
+        # up to date context, as the UI itself would:
+        if len(self.anything) > 0:
+            ui = self.ui
+            self.context = ui._get_context(ui.context)
+            for condition in self.anything[:]:
+                self._evaluate(condition)
+
+    def _evaluate(self, condition):
+        """ Evaluates a condition and sets the editor trait it controls. If the
+            condition cannot be evaluated the error is logged and the trait is
+            left unchanged.
+        """
+        when, code, editor, trait, names = condition
+        try:
+            value = bool(eval(code, globals(), self.context))
+        except:
+            logger.exception('Could not evaluate %r' % when)
+            return
+
+        setattr(editor, trait, value)
+
+#-------------------------------------------------------------------------------
+#  "_PanelParts" class:
+#-------------------------------------------------------------------------------
+
+class _PanelParts(object):
+    """ Records the groups and editors built for the panel of a UI so that,
+        when the panel is replaced by one for the same context (e.g. when a
+        live UI is reset or an InstanceEditor's view changes), the groups and
+        editors whose View elements are unchanged can be reused rather than
+        built again.
+    """
+
+    # Mapping of context key to the parts retained from each replaced panel
+    # that are waiting to be reused by a panel for the same context:
+    pending = {}
+
+    def __init__(self, ui, pool=None):
+        """ Initialise the object.
+        """
+        self.ui = ui
+        self.key = self.context_key(ui.context)
+
+        # The parts retained from the panel being replaced (if any):
+        self.pool = pool
+
+        # The registered parts in the order they were built, as tuples of the
+        # form: ( kind, plan or group, label, editor ):
+        self.log = []
+
+        # Mapping of ( group signature, suppress_label ) to a list of
+        # ( control, log entries ) for each group that can be reused:
+        self.groups = {}
+
+        # Number of pages or rows whose building has been deferred:
+        self.deferred = 0
+
+        # Mapping of editor id to each retained editor not reused yet, and of
+        # ( item signature, object id ) to a list of retained
+        # ( label, editor ):
+        self.free = {}
+        self.items = {}
+
+    @staticmethod
+    def context_key(context):
+        """ Returns a key identifying the objects of a UI context.
+        """
+        items = [ (name, id(value)) for name, value in context.items() ]
+        items.sort()
+
+        return tuple(items)
+
+    @classmethod
+    def install(cls, ui):
+        """ Installs a new set of parts for a UI, taking any pending retained
+            parts built for the same context objects, and returns it.
+        """
+        pool = cls.pending.pop(cls.context_key(ui.context), None)
+        ui._panel_parts = parts = cls(ui, pool)
+
+        return parts
+
+    def add_group(self, key, control, entries):
+        """ Records a group that can be reused.
+        """
+        self.groups.setdefault(key, []).append((control, entries))
+
+    def reuse_group(self, key):
+        """ Returns the ( control, log entries ) of a retained group with the
+            specified key, or None if there is none that can be reused.
+        """
+        pool = self.pool
+        if pool is None:
+            return None
+
+        candidates = pool.groups.get(key)
+        while candidates:
+            control, entries = candidates.pop(0)
+
+            # The group can only be reused if none of its editors have been
+            # reused elsewhere already, and they still edit the objects their
+            # items refer to:
+            for kind, plan, label, editor in entries:
+                if kind != 'editor':
+                    continue
+
+                if id(editor) not in pool.free:
+                    break
+
+                object = evaluate_expression(plan.item.object_, globals(),
+                                             self.ui.context)
+                if object is not editor.object:
+                    break
+            else:
+                for entry in entries:
+                    if entry[0] == 'editor':
+                        del pool.free[id(entry[3])]
+
+                return (control, entries)
+
+        return None
+
+    def reuse_editor(self, signature, object):
+        """ Returns the ( label, editor ) of a retained item with the specified
+            signature editing the specified object, or None if there is none
+            that can be reused.
+        """
+        pool = self.pool
+        if pool is None:
+            return None
+
+        candidates = pool.items.get((signature, id(object)))
+        while candidates:
+            label, editor = candidates.pop(0)
+            if pool.free.pop(id(editor), None) is not None:
+                return (label, editor)
+
+        return None
+
+    def retain(self):
+        """ Detaches the editors that can be reused from the UI (so that they
+            survive it being reset or disposed of) and makes them pending.
+        """
+        ui = self.ui
+
+        # Only editors that are still part of the UI can be reused:
+        live = set([ id(editor) for editor in ui._editors ])
+
+        free = self.free = {}
+        items = self.items = {}
+        for kind, plan, label, editor in self.log:
+            if (kind == 'editor') and (id(editor) in live):
+                free[id(editor)] = editor
+                key = (plan.signature, id(editor.object))
+                items.setdefault(key, []).append((label, editor))
+
+        ui._editors = [ editor for editor in ui._editors
+                        if id(editor) not in free ]
+
+        conditions = getattr(ui, '_conditions', None)
+        if conditions is not None:
+            conditions.dispose()
+
+        self.pool = None
+
+        # Any parts still pending for the same context were never reused:
+        pending = _PanelParts.pending
+        previous = pending.get(self.key)
+        if (previous is not None) and (previous is not self):
+            previous.dispose()
+
+        pending[self.key] = self
+
+    def release(self):
+        """ Disposes of the retained parts that were not reused.
+        """
+        pool = self.pool
+        if pool is not None:
+            self.pool = None
+            pool.dispose()
+
+    def release_pending(self):
+        """ Disposes of the parts if they were retained and are still waiting
+            to be reused.
+        """
+        pending = _PanelParts.pending
+        if pending.get(self.key) is self:
+            del pending[self.key]
+            self.dispose()
+
+    def dispose(self):
+        """ Disposes of the retained editors that have not been reused.
+        """
+        for editor in self.free.values():
+            editor.dispose()
+            editor.control = None
+
+        self.free = {}
+        self.items = {}
+        self.groups = {}
+
+#-------------------------------------------------------------------------------
+#  "_GridBuilder" class:
+#-------------------------------------------------------------------------------
+
+class _GridBuilder(object):
+    """ Collects the cells of a FlexTable so that the structure of the table
+        and the alignment of its cells can be created in a single pass.
+    """
+
+    def __init__(self, table):
+        """ Initialise the object.
+        """
+        self.table = table
+
+        # The list of ( row, column, widget, alignment ) for each cell:
+        self.cells = []
+
+        self.rows = self.columns = 0
+
+    def add_cell(self, row, column, w, alignment):
+        """ Adds a widget to be placed in a cell of the table.
+        """
+        self.cells.append((row, column, w, alignment))
+        self.rows = max(self.rows, row + 1)
+        self.columns = max(self.columns, column + 1)
+
+    def build(self):
+        """ Creates the rows and cells of the table and fills them.
+        """
+        table = self.table
+
+        # Create every row at its full width up front, so that adding the
+        # widgets does not have to grow the table cell by cell:
+        for row in range(self.rows):
+            table.prepareCell(row, self.columns - 1)
+
+        # Cells are left aligned by default, so only set other alignments:
+        formatter = table.getFlexCellFormatter()
+        self.cells.sort(key=lambda cell: (cell[0], cell[1]))
+        for row, column, w, alignment in self.cells:
+            table.setWidget(row, column, w)
+            if alignment != HasHorizontalAlignment.ALIGN_LEFT:
+                formatter.setHorizontalAlignment(row, column, alignment)
+
+        self.cells = []
+
 #-------------------------------------------------------------------------------
 #  A pseudo-editor that allows a group to be managed.:
 #-------------------------------------------------------------------------------
@@ -712,6 +1611,20 @@ class GroupEditor(Editor):
         """
         self.set(**traits)
 
+#-------------------------------------------------------------------------------
+#  "_Disposer" class:
+#-------------------------------------------------------------------------------
+
+class _Disposer(GroupEditor):
+    """ A pseudo-editor which disposes of an object (such as the monitor of a
+        UI's conditions) when its UI is disposed of.
+    """
+
+    def dispose(self):
+        """ Disposes of the object.
+        """
+        self._target.dispose()
+
 #-------------------------------------------------------------------------------
 #  Displays a help window for the specified UI's active Group:
 #-------------------------------------------------------------------------------